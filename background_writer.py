@@ -0,0 +1,102 @@
+"""
+Background Writer
+=================
+A bounded queue drained by one worker thread, so dump and result writes
+(compression, hashing into the dump store, disk I/O) happen off the search's
+critical path. When the queue is full, submit() blocks until a slot frees
+up, which keeps memory bounded if the disk falls behind.
+
+Failed writes are printed as they happen and kept in `errors`; flush() waits
+for everything queued so far and close() flushes and stops the worker.
+"""
+
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    def __init__(self, max_pending=16, name="dump-writer"):
+        """
+        Start the worker thread
+
+        Args:
+            max_pending (int): Writes that may wait in the queue before submit() blocks
+            name (str): Worker thread name
+        """
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.errors = []  # (description, error message) of failed writes
+        self.completed = 0
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                description, func, args, kwargs = item
+                try:
+                    func(*args, **kwargs)
+                    self.completed += 1
+                except Exception as e:
+                    self.errors.append((description, str(e)))
+                    print(f"❌ Background write failed ({description}): {e}")
+            finally:
+                self.queue.task_done()
+
+    def submit(self, description, func, *args, **kwargs):
+        """
+        Queue func(*args, **kwargs) for the worker
+
+        Args:
+            description (str): Shown when the write fails
+            func (callable): The write itself
+
+        Returns:
+            bool: False if the writer is closed and the write ran inline instead
+        """
+        if self.closed:
+            func(*args, **kwargs)
+            return False
+        if self.queue.full():
+            print(f"⏳ Writer queue full ({self.queue.maxsize}), waiting for the disk...")
+        self.queue.put((description, func, args, kwargs))
+        return True
+
+    def pending(self):
+        return self.queue.unfinished_tasks
+
+    def flush(self, timeout=None):
+        """
+        Wait for every queued write to finish
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        if timeout is None:
+            self.queue.join()
+            return True
+        end = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < end:
+            time.sleep(0.05)
+        return not self.queue.unfinished_tasks
+
+    def close(self, timeout=None):
+        """
+        Flush queued writes and stop the worker
+
+        Returns:
+            list: (description, error message) of every write that failed
+        """
+        if not self.closed:
+            self.closed = True
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"⚠️ Background writer still has {self.pending()} write(s) pending after {timeout}s")
+        return list(self.errors)
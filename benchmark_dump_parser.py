@@ -0,0 +1,68 @@
+"""
+Dump Parser Throughput Benchmark
+================================
+Measures files/s and MB/s of dump_parser over a corpus of HTML dumps, single
+process versus the process pool.
+
+Usage:
+    python benchmark_dump_parser.py [dump_dir] [copies]
+
+With copies > 0 the dumps in dump_dir are replicated into a temporary corpus
+of that many copies each, to benchmark a backlog larger than what is on disk.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import dump_parser
+
+
+def build_corpus(source_dir, copies):
+    """Replicate the dumps in source_dir into a temporary directory"""
+    corpus_dir = tempfile.mkdtemp(prefix="dump_corpus_")
+    sources = list(dump_parser.iter_dump_files(source_dir))
+    for i in range(copies):
+        for path in sources:
+            shutil.copyfile(path, os.path.join(corpus_dir, f"{i:05d}_{os.path.basename(path)}"))
+    return corpus_dir
+
+
+def run(corpus_dir, workers):
+    start = time.perf_counter()
+    files = flights = size = errors = 0
+    for result in dump_parser.parse_directory(corpus_dir, workers=workers):
+        files += 1
+        flights += len(result.flights)
+        size += result.size
+        errors += 1 if result.error else 0
+    elapsed = time.perf_counter() - start
+    return files, flights, size, errors, elapsed
+
+
+def main():
+    source_dir = sys.argv[1] if len(sys.argv) > 1 else "html_dumps"
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    corpus_dir = build_corpus(source_dir, copies) if copies else source_dir
+    try:
+        print("⏱️ Dump Parser Throughput Benchmark")
+        print(f"   Corpus: {corpus_dir} (parser: {'lxml' if dump_parser.lxml else 'html.parser'})")
+        print("=" * 60)
+        print(f"{'Workers':<10}{'Files':>8}{'Flights':>10}{'Time':>10}{'Files/s':>10}{'MB/s':>10}")
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            files, flights, size, errors, elapsed = run(corpus_dir, workers)
+            print(f"{workers:<10}{files:>8}{flights:>10}{elapsed:>9.2f}s"
+                  f"{files / elapsed:>10.1f}{size / elapsed / 1024 / 1024:>10.1f}")
+            if errors:
+                print(f"⚠️ {errors} file(s) failed to parse")
+    finally:
+        if copies:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Search Mode Benchmark
+=====================
+Runs the same searches through the booking-form flow and the deep-link flow
+on one warm browser and compares time to results.
+
+Usage:
+    python benchmark_search_modes.py [runs] [FROM TO MM/DD/YY]
+"""
+
+import statistics
+import sys
+import time
+
+from delta_flight_automation_advanced import DeltaFlightAutomationAdvanced
+
+
+def benchmark(automation, mode, search, runs):
+    """Time runs of one search mode; returns (times of successful runs, fallbacks)"""
+    times, fallbacks = [], 0
+    for i in range(runs):
+        start = time.perf_counter()
+        success = automation.run_automation(search_mode=mode, **search)
+        elapsed = time.perf_counter() - start
+        details = automation.last_search or {}
+        if details.get("deep_link_rejected"):
+            fallbacks += 1
+        status = "✅" if success else "❌"
+        print(f"   {status} {mode} run {i + 1}/{runs}: {elapsed:.2f}s {details.get('step_timings', {})}")
+        if success:
+            times.append(elapsed)
+    return times, fallbacks
+
+
+def main():
+    args = sys.argv[1:]
+    runs = int(args[0]) if args else 3
+    if len(args) >= 4:
+        search = {"from_airport": args[1], "to_airport": args[2], "date": args[3]}
+    else:
+        search = {"from_airport": "MCO", "to_airport": "BCN", "date": "09/24/25"}
+    search["use_next_available"] = False
+
+    print("⏱️ Search Mode Benchmark")
+    print("=" * 60)
+
+    # Every form run must be a full fill, not an incremental refill of the previous one
+    automation = DeltaFlightAutomationAdvanced(headless=True, use_proxy=False, incremental_refill=False)
+    try:
+        results = {mode: benchmark(automation, mode, search, runs) for mode in ("form", "deep_link")}
+    finally:
+        automation.close()
+
+    print("=" * 60)
+    print(f"{'Mode':<12}{'Succeeded':>11}{'Median':>10}{'Fallbacks':>11}")
+    medians = {}
+    for mode, (times, fallbacks) in results.items():
+        medians[mode] = statistics.median(times) if times else None
+        median = f"{medians[mode]:.2f}s" if times else "n/a"
+        print(f"{mode:<12}{len(times):>8}/{runs:<2}{median:>10}{fallbacks:>11}")
+    if medians["form"] and medians["deep_link"]:
+        print(f"💡 Deep link saves {medians['form'] - medians['deep_link']:.2f}s per search")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+ChromeDriver Startup Benchmark
+==============================
+Compares browser launch time using ChromeDriverManager().install() on every
+launch against the cached resolver in driver_resolver.py.
+"""
+
+import statistics
+import sys
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from driver_resolver import resolve_chromedriver
+
+
+def launch_and_quit(resolve):
+    """Time driver resolution and a full headless Chrome launch"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+
+    start = time.perf_counter()
+    driver_path = resolve()
+    resolved = time.perf_counter()
+    driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    launched = time.perf_counter()
+    driver.quit()
+    return resolved - start, launched - start
+
+
+def benchmark(name, resolve, runs):
+    resolve_times, launch_times = [], []
+    for i in range(runs):
+        resolve_time, launch_time = launch_and_quit(resolve)
+        resolve_times.append(resolve_time)
+        launch_times.append(launch_time)
+        print(f"   {name} run {i + 1}/{runs}: resolve {resolve_time:.2f}s, launch {launch_time:.2f}s")
+    return statistics.median(resolve_times), statistics.median(launch_times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("⏱️ ChromeDriver Startup Benchmark")
+    print("=" * 60)
+
+    # Prime both caches so the comparison measures steady-state launches
+    ChromeDriverManager().install()
+    resolve_chromedriver()
+
+    wdm_resolve, wdm_launch = benchmark("webdriver-manager", lambda: ChromeDriverManager().install(), runs)
+    cached_resolve, cached_launch = benchmark("cached resolver", resolve_chromedriver, runs)
+
+    print("=" * 60)
+    print(f"{'Method':<20}{'Resolve (median)':>18}{'Launch (median)':>18}")
+    print(f"{'webdriver-manager':<20}{wdm_resolve:>17.3f}s{wdm_launch:>17.3f}s")
+    print(f"{'cached resolver':<20}{cached_resolve:>17.3f}s{cached_launch:>17.3f}s")
+    print(f"💡 Saved per launch: {wdm_launch - cached_launch:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
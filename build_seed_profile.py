@@ -0,0 +1,158 @@
+"""
+Minimal Seed Profile Builder
+============================
+Builds a small seed profile from the checked-in chrome_profile (~107 MB),
+keeping only what a Delta search needs: delta.com cookies, Local Storage,
+preferences and the Local State file (which holds the cookie encryption key).
+
+Usage:
+    python build_seed_profile.py [source_dir] [output_dir] [--benchmark]
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chrome_profile")
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_profile")
+
+# Paths relative to the profile root that make up the minimal seed
+KEEP_FILES = [
+    "Local State",
+    os.path.join("Default", "Preferences"),
+    os.path.join("Default", "Secure Preferences"),
+]
+KEEP_DIRS = [
+    os.path.join("Default", "Local Storage"),
+]
+COOKIE_DBS = [
+    os.path.join("Default", "Network", "Cookies"),
+    os.path.join("Default", "Cookies"),  # pre-Chrome 96 location
+]
+COOKIE_DOMAINS = ["delta.com"]
+
+
+def dir_size(path):
+    """Total size of a directory tree in bytes"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def copy_cookies(src, dst, domains=COOKIE_DOMAINS):
+    """Copy a Cookies database keeping only rows for the given domains"""
+    shutil.copy2(src, dst)
+    conn = sqlite3.connect(dst)
+    try:
+        # The domain itself and its subdomains (".delta.com", "www.delta.com"), never "notdelta.com"
+        where = " OR ".join("host_key = ? OR host_key = ? OR host_key LIKE ?" for _ in domains)
+        params = [value for domain in domains for value in (domain, f".{domain}", f"%.{domain}")]
+        kept = conn.execute(f"SELECT COUNT(*) FROM cookies WHERE {where}", params).fetchone()[0]
+        conn.execute(f"DELETE FROM cookies WHERE NOT ({where})", params)
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return kept
+
+
+def build_seed(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR):
+    """Build the minimal seed profile and return its path"""
+    if not os.path.exists(source_dir):
+        raise FileNotFoundError(f"Source profile not found: {source_dir}")
+
+    print(f"🔄 Building minimal seed profile from {source_dir}...")
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(os.path.join(output_dir, "Default"))
+
+    for rel in KEEP_FILES:
+        src = os.path.join(source_dir, rel)
+        if os.path.exists(src):
+            shutil.copy2(src, os.path.join(output_dir, rel))
+            print(f"   ✅ {rel}")
+
+    for rel in KEEP_DIRS:
+        src = os.path.join(source_dir, rel)
+        if os.path.exists(src):
+            shutil.copytree(src, os.path.join(output_dir, rel), ignore=shutil.ignore_patterns("LOCK", "LOG", "LOG.old"))
+            print(f"   ✅ {rel}/")
+
+    for rel in COOKIE_DBS:
+        src = os.path.join(source_dir, rel)
+        if os.path.exists(src):
+            dst = os.path.join(output_dir, rel)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            kept = copy_cookies(src, dst)
+            print(f"   ✅ {rel} ({kept} delta.com cookies)")
+
+    return output_dir
+
+
+def time_launch(profile_dir, runs=3):
+    """Median time to launch headless Chrome on a throwaway copy of a profile"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from driver_resolver import resolve_chromedriver
+
+    driver_path = resolve_chromedriver()
+    times = []
+    for _ in range(runs):
+        work_dir = tempfile.mkdtemp(prefix="seed_bench_")
+        try:
+            # Include the copy in the timing: that's what every launch pays
+            start = time.perf_counter()
+            profile_copy = os.path.join(work_dir, "profile")
+            shutil.copytree(profile_dir, profile_copy, ignore=shutil.ignore_patterns("Singleton*", "lockfile"))
+
+            chrome_options = Options()
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument(f"--user-data-dir={profile_copy}")
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            driver.get("about:blank")
+            times.append(time.perf_counter() - start)
+            driver.quit()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    source_dir = args[0] if len(args) > 0 else SOURCE_DIR
+    output_dir = args[1] if len(args) > 1 else OUTPUT_DIR
+
+    print("🌱 Minimal Seed Profile Builder")
+    print("=" * 60)
+
+    before = dir_size(source_dir)
+    build_seed(source_dir, output_dir)
+    after = dir_size(output_dir)
+
+    print("=" * 60)
+    print(f"💾 Disk usage before: {before / 1024 / 1024:.1f} MB")
+    print(f"💾 Disk usage after:  {after / 1024 / 1024:.2f} MB")
+    print(f"📉 Reduction: {100 * (1 - after / before):.1f}%" if before else "")
+
+    if "--benchmark" in sys.argv:
+        print("\n⏱️ Measuring copy + launch time (median of 3)...")
+        launch_before = time_launch(source_dir)
+        launch_after = time_launch(output_dir)
+        print(f"🚀 Launch with full profile: {launch_before:.2f}s")
+        print(f"🚀 Launch with seed profile: {launch_after:.2f}s")
+        print(f"💡 Saved per launch: {launch_before - launch_after:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
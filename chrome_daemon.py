@@ -0,0 +1,361 @@
+"""
+Persistent Chrome Daemon
+========================
+Supervised launcher that keeps one or more Chrome instances running with
+remote debugging enabled (the Profile_setting.py approach on port 8989), so
+bot processes attach through debuggerAddress instead of spawning a browser.
+Chrome is started detached and survives Python restarts; dead instances are
+detected through the DevTools HTTP endpoint and restarted.
+
+Each instance's profile lock is owned by its Chrome pid, so it stays held
+while Chrome runs. Bots attaching with debugger_address="auto" take a
+per-port lease (a lock file owned by the bot's pid), so no two bots drive
+the same Chrome.
+
+Usage:
+    python chrome_daemon.py start [port ...]
+    python chrome_daemon.py supervise [port ...]
+    python chrome_daemon.py status
+    python chrome_daemon.py stop
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+from driver_resolver import find_chrome_binary
+from profile_manager import ProfileManager, file_lock, pid_alive
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_PORTS = [8989]
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(BASE_DIR, "chrome_daemon_state.json")
+STATE_LOCK_FILE = STATE_FILE + ".lock"
+DAEMON_PROFILES_DIR = os.path.join(BASE_DIR, "daemon_profiles")
+LEASES_DIR = os.path.join(DAEMON_PROFILES_DIR, "leases")
+
+
+def is_healthy(port, timeout=2):
+    """Return the DevTools /json/version info if Chrome answers on this port, else None"""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except Exception:
+        return None
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_state(port, record):
+    """
+    Set (or with record=None, remove) one port's record in the state file
+
+    The file is re-read and rewritten under a lock, so records written by other
+    processes (the supervisor, bots restarting their instance) are kept.
+
+    Returns:
+        dict: The merged state
+    """
+    with file_lock(STATE_LOCK_FILE):
+        state = load_state()
+        if record is None:
+            state.pop(str(port), None)
+        else:
+            state[str(port)] = record
+        tmp_path = f"{STATE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, STATE_FILE)
+    return state
+
+
+def port_lock(port):
+    """Per-port lock held while an instance is health-checked or restarted"""
+    os.makedirs(DAEMON_PROFILES_DIR, exist_ok=True)
+    return file_lock(os.path.join(DAEMON_PROFILES_DIR, f"port_{port}.restart.lock"))
+
+
+def _command_line(pid):
+    """Command line of a process as one string, or None if it cannot be read"""
+    if psutil:
+        try:
+            return " ".join(psutil.Process(pid).cmdline())
+        except psutil.Error:
+            return None
+    if sys.platform.startswith("linux"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                return f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+        except OSError:
+            return None
+    if sys.platform.startswith("win"):
+        try:
+            result = subprocess.run(
+                ["powershell", "-NoProfile", "-Command",
+                 f"(Get-CimInstance Win32_Process -Filter 'ProcessId={int(pid)}').CommandLine"],
+                capture_output=True, text=True, timeout=10
+            )
+            return result.stdout.strip() or None
+        except Exception:
+            return None
+    return None
+
+
+def is_instance_process(pid, port):
+    """Whether pid is still the Chrome launched for this port (pids get reused)"""
+    command_line = _command_line(pid)
+    return bool(command_line) and f"--remote-debugging-port={port}" in command_line
+
+
+def find_healthy_instance(ports=None):
+    """Return 'host:port' of the first running daemon instance, or None"""
+    candidates = ports or [int(port) for port in load_state()] or DEFAULT_PORTS
+    for port in candidates:
+        if is_healthy(port):
+            return f"127.0.0.1:{port}"
+    return None
+
+
+def _leases():
+    # Lock files only: the lease "profiles" are never derived
+    return ProfileManager(workers_dir=LEASES_DIR)
+
+
+def lease_instance(ports=None):
+    """
+    Lease a running daemon instance that no other bot is driving
+
+    The lease is a lock file keyed by port and owned by this process, so it is
+    cleared as stale when the process dies.
+
+    Returns:
+        str: 'host:port' of the leased instance, or None if all are taken or down
+    """
+    candidates = ports or [int(port) for port in load_state()] or DEFAULT_PORTS
+    leases = _leases()
+    for port in candidates:
+        if not is_healthy(port):
+            continue
+        if leases.try_lock(port):
+            return f"127.0.0.1:{port}"
+        print(f"⏭️ Chrome daemon instance on port {port} is leased by another bot")
+    return None
+
+
+def release_lease(port):
+    """Give a leased instance back"""
+    _leases().release(int(port))
+
+
+def instance_pid(port):
+    """Recorded Chrome pid of a daemon instance, or None if the port is not a daemon instance"""
+    return load_state().get(str(port), {}).get("pid")
+
+
+def restart_instance(port):
+    """Stop and relaunch one daemon instance (used to recycle a bloated attached Chrome)"""
+    # Holding the port lock keeps a supervisor from starting a second Chrome meanwhile
+    with port_lock(port):
+        daemon = ChromeDaemon(ports=[port])
+        record = load_state().get(str(port))
+        if record:
+            daemon._kill(record.get("pid"), port)
+            update_state(port, None)
+        return daemon.start_instance(port)
+
+
+class ChromeDaemon:
+    def __init__(self, ports=None, headless=False, proxy_server=None, extra_args=None, seed_dir=None):
+        """
+        Initialize the daemon
+
+        Args:
+            ports (list): Remote debugging ports, one Chrome instance per port
+            headless (bool): Launch instances in headless mode
+            proxy_server (str): Proxy passed to every instance
+            extra_args (list): Additional Chrome command line arguments
+            seed_dir (str): Seed profile for new instance profiles
+        """
+        self.ports = [int(port) for port in (ports or DEFAULT_PORTS)]
+        self.headless = headless
+        self.proxy_server = proxy_server
+        self.extra_args = list(extra_args or [])
+        profile_kwargs = {"workers_dir": DAEMON_PROFILES_DIR}
+        if seed_dir:
+            profile_kwargs["seed_dir"] = seed_dir
+        self.profiles = ProfileManager(**profile_kwargs)
+        self.state = load_state()  # Refreshed from disk on every update
+
+    def _profile_for(self, port):
+        """Profile directory for a port, derived from the seed on first use"""
+        if port in self.profiles.held:
+            return self.profiles.held[port]
+        return self.profiles.acquire(worker_id=port, refresh=False)
+
+    def start_instance(self, port, wait=30):
+        """Launch a detached Chrome with remote debugging on a port"""
+        chrome = find_chrome_binary()
+        if not chrome:
+            raise FileNotFoundError("Chrome executable not found")
+
+        command = [
+            chrome,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={self._profile_for(port)}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-blink-features=AutomationControlled",
+            "--window-size=1920,1080",
+        ]
+        if self.headless:
+            command.append("--headless=new")
+        if self.proxy_server:
+            command.append(f"--proxy-server={self.proxy_server}")
+        command.extend(self.extra_args)
+
+        # Detach so Chrome outlives this Python process
+        popen_kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if sys.platform.startswith("win"):
+            popen_kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs["start_new_session"] = True
+        process = subprocess.Popen(command, **popen_kwargs)
+        # The profile stays locked for as long as this Chrome runs
+        self.profiles.set_owner(port, process.pid)
+
+        deadline = time.time() + wait
+        while time.time() < deadline:
+            info = is_healthy(port)
+            if info:
+                self.state = update_state(port, {
+                    "pid": process.pid,
+                    "browser": info.get("Browser"),
+                    "started_at": datetime.now().isoformat(timespec="seconds"),
+                })
+                print(f"✅ Chrome daemon instance up on port {port} (pid {process.pid})")
+                return True
+            if process.poll() is not None:
+                break
+            time.sleep(0.5)
+
+        print(f"❌ Chrome instance on port {port} did not become healthy")
+        self._kill(process.pid, port)
+        return False
+
+    def _kill(self, pid, port, wait=10):
+        """Stop a Chrome process group and wait for it to exit (its profile lock is then stale)"""
+        if not pid or not pid_alive(pid):
+            return
+        if not is_instance_process(pid, port):
+            # The recorded Chrome is gone and its pid was reused (or cannot be checked)
+            print(f"⚠️ pid {pid} is not the Chrome for port {port}, not killing it")
+            return
+        try:
+            if sys.platform.startswith("win"):
+                subprocess.run(["taskkill", "/f", "/t", "/pid", str(pid)], capture_output=True)
+            else:
+                os.killpg(os.getpgid(pid), signal.SIGTERM)
+        except Exception as e:
+            print(f"⚠️ Could not stop pid {pid}: {e}")
+            return
+
+        deadline = time.time() + wait
+        while time.time() < deadline:
+            if not sys.platform.startswith("win"):
+                try:
+                    # Reap it if it is our own child, otherwise it lingers as a zombie
+                    os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    pass
+            if not pid_alive(pid):
+                return
+            time.sleep(0.2)
+        print(f"⚠️ pid {pid} still running {wait}s after SIGTERM")
+
+    def ensure_running(self):
+        """Health-check every port and restart dead instances"""
+        healthy = []
+        for port in self.ports:
+            if is_healthy(port):
+                healthy.append(port)
+                continue
+            # Waits out a restart a bot is doing, then re-checks before acting
+            with port_lock(port):
+                if is_healthy(port):
+                    healthy.append(port)
+                    continue
+                record = load_state().get(str(port))
+                if record:
+                    print(f"⚠️ Chrome instance on port {port} is not responding, restarting...")
+                    self._kill(record.get("pid"), port)
+                    self.state = update_state(port, None)
+                if self.start_instance(port):
+                    healthy.append(port)
+        return healthy
+
+    def supervise(self, interval=10):
+        """Keep all instances alive until interrupted"""
+        print(f"👀 Supervising Chrome instances on ports {self.ports} (every {interval}s)")
+        try:
+            while True:
+                self.ensure_running()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\n⏹️ Supervisor stopped (Chrome instances keep running)")
+
+    def status(self):
+        """Print the health of every known instance"""
+        self.state = load_state()
+        ports = sorted(set(self.ports) | {int(port) for port in self.state})
+        for port in ports:
+            info = is_healthy(port)
+            record = self.state.get(str(port), {})
+            if info:
+                print(f"✅ Port {port}: {info.get('Browser')} (pid {record.get('pid')}, since {record.get('started_at')})")
+            else:
+                print(f"❌ Port {port}: not responding")
+
+    def stop(self):
+        """Stop every recorded instance"""
+        for port, record in list(load_state().items()):
+            with port_lock(port):
+                self._kill(record.get("pid"), port)
+                self.profiles.release(int(port))
+                self.state = update_state(port, None)
+            print(f"🛑 Stopped Chrome instance on port {port}")
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else "status"
+    ports = [int(port) for port in args[1:]] or None
+
+    daemon = ChromeDaemon(ports=ports)
+    if command == "start":
+        # Profile locks are owned by the Chrome pids and outlive this process
+        daemon.ensure_running()
+    elif command == "supervise":
+        daemon.supervise()
+    elif command == "stop":
+        daemon.stop()
+    else:
+        daemon.status()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Delta Search Deep Links
+=======================
+Builds a flight-search URL straight from (origin, destination, date, trip type)
+so the bot can skip the homepage booking widget. Delta changes its query
+format from time to time; when the site rejects a link the bot falls back to
+filling the form, so the template lives here in one place to update.
+"""
+
+from datetime import datetime
+from urllib.parse import urlencode
+
+SEARCH_URL = "https://www.delta.com/flightsearch/book-a-flight"
+
+TRIP_TYPES = {
+    "one_way": "ONE_WAY",
+    "round_trip": "ROUND_TRIP",
+    "multi_city": "MULTI_CITY",
+}
+
+
+def build_search_url(from_airport, to_airport, date, trip_type="one_way", return_date=None, passengers=1):
+    """
+    Build the flight-search deep link
+
+    Args:
+        from_airport (str): Origin airport code
+        to_airport (str): Destination airport code
+        date (str): Departure date in MM/DD/YY format (same as run_automation)
+        trip_type (str): one_way, round_trip or multi_city
+        return_date (str): Return date in MM/DD/YY format for round trips
+        passengers (int): Number of adult passengers
+
+    Returns:
+        str: URL that opens the search results directly
+    """
+    if trip_type not in TRIP_TYPES:
+        raise ValueError(f"Unsupported trip type for deep links: {trip_type}")
+
+    params = {
+        "action": "findFlights",
+        "tripType": TRIP_TYPES[trip_type],
+        "fromCity": from_airport.upper(),
+        "toCity": to_airport.upper(),
+        "departureDate": datetime.strptime(date, "%m/%d/%y").strftime("%m/%d/%Y"),
+        "paxCount": passengers,
+        "priceSchedule": "PRICE",
+        "awardTravel": "false",
+        "flexAirport": "false",
+        "datesFlexible": "false",
+    }
+    if return_date:
+        params["returnDate"] = datetime.strptime(return_date, "%m/%d/%y").strftime("%m/%d/%Y")
+    return f"{SEARCH_URL}?{urlencode(params)}"
@@ -15,7 +15,7 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolve_chromedriver
 
 
 class DeltaFlightAutomationAdvanced:
@@ -129,8 +129,8 @@ class DeltaFlightAutomationAdvanced:
             if headless:
                 chrome_options.add_argument("--headless=new")  # Use new headless mode
             
-            # Use WebDriver Manager to automatically download and manage ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            # Use the pinned ChromeDriver (re-resolved only when Chrome's major version changes)
+            service = Service(resolve_chromedriver())
             
             # Initialize driver
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
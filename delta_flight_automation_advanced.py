@@ -6,6 +6,8 @@ This version automatically manages ChromeDriver installation
 
 import time
 import os
+import sys
+import json
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,11 +17,80 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.common.keys import Keys
+from driver_resolver import resolve_chromedriver
+from request_policy import RequestBlockingPolicy
+from driver_recycling import RecyclePolicy, process_tree_rss
+from wait_engine import WaitEngine, enable_performance_log
+from selector_cache import SelectorCache, entry_key
+import form_batch
+from deep_link import build_search_url
+from search_deadline import SearchDeadline
+from offer_capture import OfferCapture
+from flight_extractor import extract_flights
+from dump_store import DumpStore
+from background_writer import BackgroundWriter
+from form_values import airport_code, parse_widget_date
+
+# Selectors that indicate flight results have rendered
+RESULT_SELECTORS = [
+    "div.flight-results-grid",
+    "div[id*='flight-results']",
+    "[class*='flight-card']",
+    "[class*='flight-results']",
+    "div[class*='mach-flight-results-grid']"
+]
+
+# Airport lookup modal and its close button
+AIRPORT_MODAL_CSS = "ngc-airport-lookup-modal, modal-container"
+MODAL_CLOSE_SELECTORS = [
+    (By.CSS_SELECTOR, "ngc-airport-lookup-modal button[aria-label*='close' i]"),
+    (By.CSS_SELECTOR, "modal-container button.close"),
+    (By.CSS_SELECTOR, "modal-container [class*='close']")
+]
+
+# Date picker header, present once the calendar has rendered
+CALENDAR_HEADER_SELECTORS = [
+    (By.CSS_SELECTOR, ".dl-datepicker-title"),
+    (By.CSS_SELECTOR, ".calendar-title"),
+    (By.CSS_SELECTOR, "[class*='month-year']"),
+    (By.CSS_SELECTOR, "[class*='calendar-header']")
+]
+
+# Booking widget fields read back by the step post-conditions
+FORM_FIELD_SELECTORS = {
+    "from": [(By.XPATH, "/html/body/idp-root/ngc-global-nav/header/div/div[1]/ngc-book/div[1]/div/form/div[1]/div/div[1]/div[1]/div[1]/div[1]/a[1]")],
+    "to": [
+        (By.XPATH, "/html/body/idp-root/ngc-global-nav/header/div/div[1]/ngc-book/div[1]/div/form/div[1]/div/div[1]/div[1]/div[1]/div[1]/a[2]"),
+        (By.CSS_SELECTOR, "a[aria-label*='To']")
+    ],
+    "trip_type": [
+        (By.XPATH, "/html/body/idp-root/ngc-global-nav/header/div/div[1]/ngc-book/div[1]/div/form/div[1]/div/div[1]/div[1]/div[2]/span"),
+        (By.CSS_SELECTOR, "span[class*='trip-type']")
+    ],
+    "date": [
+        (By.XPATH, "/html/body/idp-root/ngc-global-nav/header/div/div[1]/ngc-book/div[1]/div/form/div[1]/div/div[1]/div[1]/div[3]/date-selection-view"),
+        (By.CSS_SELECTOR, "div[class*='depart']")
+    ]
+}
+
+# Text the trip type field shows for each trip type
+TRIP_TYPE_LABELS = {
+    "round_trip": "ROUND TRIP",
+    "one_way": "ONE WAY",
+    "multi_city": "MULTI"
+}
+
+# Date picker "next month" button
+CALENDAR_NEXT_SELECTORS = [
+    "button[aria-label*='next' i]",
+    ".dl-datepicker-next",
+    "button[class*='next']"
+]
 
 
 class DeltaFlightAutomationAdvanced:
-    def __init__(self, headless=True, timeout=30, use_proxy=True):
+    def __init__(self, headless=True, timeout=30, use_proxy=True, block_resources=True, request_policy=None, lifecycle="process", debugger_address=None, recycle_policy=None, selector_cache=None, batch_form=True, search_mode="form", search_budget=180, incremental_refill=True, save_html_dumps=False, dump_store=None, background_writes=True):
         """
         Initialize the Delta Flight Automation with WebDriver Manager
         
@@ -27,15 +98,107 @@ class DeltaFlightAutomationAdvanced:
             headless (bool): Run browser in headless mode
             timeout (int): Default timeout for WebDriverWait
             use_proxy (bool): Use proxy server for requests
+            block_resources (bool): Block images/fonts/media/analytics via CDP
+            request_policy (RequestBlockingPolicy): Custom per-step blocking policy
+            lifecycle (str): "process" shares one browser state across searches,
+                "context" runs each search in a disposable CDP browser context
+            debugger_address (str): Attach to a running Chrome ("host:port") instead of
+                launching one; "auto" leases a healthy chrome_daemon.py instance that
+                no other bot is driving
+            recycle_policy (RecyclePolicy): When to relaunch a long-lived browser
+                (defaults to RecyclePolicy(); pass False to disable)
+            selector_cache (SelectorCache): Learned selector/click-method winners
+                (defaults to SelectorCache(); pass False to disable)
+            batch_form (bool): Fill each form phase with one in-page script, falling
+                back to the step-by-step WebDriver path when a phase fails
+            search_mode (str): "form" fills the booking widget, "deep_link" opens the
+                results URL directly and falls back to the form when it is rejected
+            search_budget (float): Seconds a whole search may take; every wait is
+                capped to what is left of it (None for no limit)
+            incremental_refill (bool): On consecutive searches, only touch the form
+                fields that differ and re-submit from the current page
+            save_html_dumps (bool): Also save full page_source dumps to the dump store
+                (debugging only; flights are extracted in-page either way)
+            dump_store (DumpStore): Compressed store the HTML dumps go to
+                (a DumpStore() in dump_store/ is created on first use)
+            background_writes (bool): Compress and write dumps and result files on a
+                background thread; close() flushes them
         """
         self.timeout = timeout
         self.driver = None
         self.wait = None
         self.use_proxy = True
+        self.headless = headless
+        self.request_policy = (request_policy or RequestBlockingPolicy()) if block_resources else None
+        self.last_search = None  # Details of the most recent run_automation call
+        self.lifecycle = lifecycle
+        self.base_window = None  # Default-context tab that outlives search contexts
+        self.search_context = None  # (browserContextId, targetId) of the open search context
+        self.debugger_address = debugger_address
+        self.leased_port = None  # chrome_daemon.py instance leased with debugger_address="auto"
+        self.attached_port = None  # Debugging port of the Chrome the driver is attached to
+        self.rss_warning_shown = False
+        self.recycle_policy = RecyclePolicy() if recycle_policy is None else recycle_policy
+        self.searches_served = 0
+        self.recycle_events = []
+        self.waits = None  # WaitEngine bound to the current driver
+        self.offer_capture = None  # rm-offer-gql responses seen by the current driver
+        self.selector_cache = SelectorCache() if selector_cache is None else selector_cache
+        self.batch_form = batch_form
+        self.search_mode = search_mode
+        self.search_budget = search_budget
+        self.deadline = SearchDeadline(None)  # Replaced at the start of every search
+        self.checkpoint = None  # Search params and steps whose post-conditions were confirmed
+        self.incremental_refill = incremental_refill
+        self.form_state = None  # Params of the last search submitted through the form
+        self.save_html_dumps = save_html_dumps
+        self.dump_store = dump_store
+        self.background_writes = background_writes
+        self.writer = None  # BackgroundWriter, started on the first queued write
+        self.write_errors_reported = 0
         self.setup_driver(headless)
         
+    def attach_driver(self, debugger_address):
+        """Attach to an already running Chrome (see chrome_daemon.py) via debuggerAddress"""
+        print(f"🔌 Attaching to running Chrome at {debugger_address}...")
+        
+        # Launch flags (proxy, headless, window size) belong to the daemon;
+        # chromedriver rejects most launch-only options when attaching
+        chrome_options = Options()
+        chrome_options.add_experimental_option("debuggerAddress", debugger_address)
+        enable_performance_log(chrome_options)
+        
+        service = Service(resolve_chromedriver())
+        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.wait = WebDriverWait(self.driver, self.timeout)
+        self.bind_waits()
+        self.apply_request_policy("Navigate to Delta")
+        self.attached_port = int(debugger_address.rsplit(":", 1)[1])
+        print(f"✅ Attached to Chrome at {debugger_address}")
+    
     def setup_driver(self, headless=False):
         """Setup Chrome WebDriver with automatic driver management and optional proxy"""
+        if self.debugger_address:
+            address = self.debugger_address
+            if address == "auto" and self.leased_port is not None:
+                # Recycled: reattach to the instance this bot still leases
+                address = f"127.0.0.1:{self.leased_port}"
+            elif address == "auto":
+                from chrome_daemon import lease_instance
+                address = lease_instance()
+                if address:
+                    self.leased_port = int(address.rsplit(":", 1)[1])
+            if address:
+                try:
+                    self.attach_driver(address)
+                    return
+                except Exception as e:
+                    print(f"⚠️ Could not attach to {address}: {e}")
+                    self.release_lease()
+            print("🔄 No running Chrome to attach to, launching a new one...")
+        
+        self.attached_port = None
         try:
             print("🔄 Setting up ChromeDriver...")
             
@@ -57,8 +220,8 @@ class DeltaFlightAutomationAdvanced:
             # Performance optimizations
             # chrome_options.add_argument("--disable-extensions")
             # chrome_options.add_argument("--disable-plugins")
-            # chrome_options.add_argument("--disable-images")  # Faster loading
-            # Note: JavaScript is needed for Delta's calendar functionality
+            # Note: JavaScript is needed for Delta's calendar functionality, so
+            # images/fonts/analytics are blocked per step via CDP instead (see request_policy.py)
             
             # Window size and user agent
             chrome_options.add_argument("--window-size=1920,1080")
@@ -67,13 +230,18 @@ class DeltaFlightAutomationAdvanced:
             if headless:
                 chrome_options.add_argument("--headless")
             
-            # Use WebDriver Manager to automatically download and manage ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            # CDP Network events feed the network-idle waits
+            enable_performance_log(chrome_options)
+            
+            # Use the pinned ChromeDriver (re-resolved only when Chrome's major version changes)
+            service = Service(resolve_chromedriver())
             
             # Initialize driver
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.wait = WebDriverWait(self.driver, self.timeout)
+            self.bind_waits()
+            self.apply_request_policy("Navigate to Delta")
             
             proxy_status = "with proxy" if self.use_proxy else "without proxy"
             print(f"✅ Chrome WebDriver initialized successfully {proxy_status}")
@@ -85,46 +253,194 @@ class DeltaFlightAutomationAdvanced:
                 print("💡 Check your proxy connection")
             raise
     
+    def bind_waits(self):
+        """Attach the wait engine and the GraphQL offer capture to a new driver"""
+        self.waits = WaitEngine(self.driver)
+        self.offer_capture = OfferCapture(self.driver)
+        self.waits.add_listener(self.offer_capture.on_event)
+    
+    def open_search_context(self):
+        """Open an incognito-like CDP browser context and focus a tab inside it"""
+        try:
+            if self.search_context:
+                self.close_search_context()
+            
+            self.base_window = self.driver.current_window_handle
+            context_id = self.driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": True}
+            )["browserContextId"]
+            target_id = self.driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+            )["targetId"]
+            self.search_context = (context_id, target_id)
+            
+            # chromedriver picks up new targets asynchronously
+            WebDriverWait(self.driver, 10).until(lambda driver: target_id in driver.window_handles)
+            self.driver.switch_to.window(target_id)
+            print(f"🧪 Opened browser context {context_id[:8]}... for this search")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️ Could not open browser context ({e}), clearing shared state instead")
+            self.search_context = None
+            try:
+                self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            except Exception:
+                pass
+            return False
+    
+    def close_search_context(self):
+        """Dispose the current search context and free its memory"""
+        if not self.search_context:
+            return
+        context_id, target_id = self.search_context
+        self.search_context = None
+        try:
+            if self.base_window:
+                self.driver.switch_to.window(self.base_window)
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+            print(f"🧹 Disposed browser context {context_id[:8]}...")
+        except Exception as e:
+            print(f"⚠️ Error disposing browser context: {e}")
+    
+    def apply_request_policy(self, step):
+        """Switch the CDP blocked-URL list to the one configured for a step"""
+        if self.request_policy and self.driver:
+            self.request_policy.apply(self.driver, step)
+    
+    def cap(self, timeout):
+        """Shorten a wait's timeout to the remaining search budget"""
+        return self.deadline.cap(timeout)
+    
+    def settle(self, timeout, idle_ms=500, quiet_ms=300):
+        """Wait for network idle + DOM quiescence, at most timeout seconds (replaces fixed sleeps)"""
+        timeout = self.cap(timeout)
+        if self.waits:
+            return self.waits.settle(timeout=timeout, idle_ms=idle_ms, quiet_ms=quiet_ms)
+        time.sleep(timeout)
+        return True
+    
+    def settle_dom(self, timeout, quiet_ms=200):
+        """Wait until the DOM stops mutating, at most timeout seconds"""
+        timeout = self.cap(timeout)
+        if self.waits:
+            return self.waits.wait_for_dom_quiet(quiet_ms=quiet_ms, timeout=timeout)
+        time.sleep(timeout)
+        return True
+    
+    def wait_for_angular(self, timeout, fallback_idle_ms=500):
+        """
+        Wait until the Angular app is stable, at most timeout seconds
+        
+        Settles on the network instead when Angular testability is not exposed, and
+        when whenStable times out (long-lived timers keep some zones from ever going stable).
+        """
+        timeout = self.cap(timeout)
+        start = time.time()
+        stable = self.waits.wait_for_angular_stable(timeout) if self.waits else None
+        if stable is None:
+            return self.settle(timeout - (time.time() - start), idle_ms=fallback_idle_ms)
+        if not stable:
+            return self.settle(min(timeout, 2), idle_ms=fallback_idle_ms)
+        return stable
+    
+    def run_form_phase(self, actions, description):
+        """Run a batched form phase in one round trip; True if every action succeeded"""
+        if not self.batch_form:
+            return False
+        result = form_batch.run_phase(self.driver, actions, timeout=self.cap(20))
+        if result["ok"]:
+            print(f"⚡ Batched {description}: {len(result['steps'])} action(s) in {result['round_trip']:.2f}s")
+            return True
+        print(f"⚠️ Batched {description} failed at '{result['failed']}' ({result['error']}), using step-by-step path")
+        if result.get("steps"):
+            # The step-by-step path starts from the closed widget, not mid-phase
+            self.dismiss_form_overlays()
+        return False
+    
+    def dismiss_form_overlays(self):
+        """Close what a partially run form phase left open (airport modal, dropdown, calendar)"""
+        modal_open = lambda: self.driver.execute_script("return !!document.querySelector(arguments[0]);", AIRPORT_MODAL_CSS)
+        try:
+            ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
+        except Exception:
+            pass
+        if self._holds(modal_open):
+            match = self.waits.first_match(MODAL_CLOSE_SELECTORS, timeout=0) if self.waits else None
+            if match:
+                try:
+                    self.driver.execute_script("arguments[0].click();", match[1])
+                except Exception:
+                    pass
+        if not self.wait_until(lambda: not self._holds(modal_open), 2):
+            print("⚠️ Airport lookup modal is still open")
+            return False
+        return True
+    
+    def wait_until(self, condition, timeout):
+        """Wait until condition() is truthy, at most timeout seconds"""
+        timeout = self.cap(timeout)
+        if self.waits:
+            return self.waits.until(condition, timeout=timeout)
+        time.sleep(timeout)
+        return condition()
+    
     def smart_wait_and_click(self, selectors, timeout=None, description="element"):
         """
         Smart function to try multiple selectors and click strategies
         
+        All selectors are raced in one in-page script per poll, so a late
+        winner no longer pays for the misses in front of it.
+        
         Args:
             selectors (list): List of tuples (By, selector_string)
             timeout: Custom timeout
             description: Description for logging
         """
         timeout = timeout or self.timeout
+        # Descriptions are reused with different selector lists, so the list is part of the key
+        cache_key = entry_key(description, selectors)
+        # Learned winner first, then the remaining fallbacks in their listed order
+        remaining = self.selector_cache.order(cache_key, selectors) if self.selector_cache else list(range(len(selectors)))
+        # Same worst case as the old 5s-per-selector loop, but returns on the first match
+        deadline = time.time() + self.cap(min(timeout, 5 * len(selectors)))
         
-        for i, (by, selector) in enumerate(selectors, 1):
-            try:
-                print(f"🔍 Trying selector {i}/{len(selectors)} for {description}")
-                
-                # Wait for element to be present
-                element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((by, selector))
-                )
-                
-                # Try different click strategies
-                click_methods = [
-                    lambda el: WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(el)).click(),
-                    lambda el: self.driver.execute_script("arguments[0].click();", el),
-                    lambda el: ActionChains(self.driver).move_to_element(el).click().perform(),
-                    lambda el: el.click()
-                ]
-                
-                for j, click_method in enumerate(click_methods, 1):
-                    try:
-                        click_method(element)
-                        print(f"✅ Successfully clicked {description} using selector {i}, method {j}")
-                        return True
-                    except Exception as click_error:
-                        print(f"⚠️ Click method {j} failed: {click_error}")
-                        continue
-                        
-            except Exception as e:
-                print(f"⚠️ Selector {i} failed for {description}: {e}")
-                continue
+        while remaining:
+            match = self.waits.first_match([selectors[i] for i in remaining], timeout=max(0, deadline - time.time()))
+            if not match:
+                break
+            i = remaining.pop(match[0])
+            element = match[1]
+            print(f"🔍 Selector {i + 1}/{len(selectors)} matched for {description}")
+            
+            # Try different click strategies
+            click_methods = [
+                lambda el: WebDriverWait(self.driver, self.cap(5)).until(EC.element_to_be_clickable(el)).click(),
+                lambda el: self.driver.execute_script("arguments[0].click();", el),
+                lambda el: ActionChains(self.driver).move_to_element(el).click().perform(),
+                lambda el: el.click()
+            ]
+            
+            by, selector = selectors[i]
+            if self.selector_cache:
+                method_order = self.selector_cache.method_order(cache_key, by, selector, len(click_methods))
+            else:
+                method_order = list(range(len(click_methods)))
+            
+            for j in method_order:
+                try:
+                    click_methods[j](element)
+                    print(f"✅ Successfully clicked {description} using selector {i + 1}, method {j + 1}")
+                    if self.selector_cache:
+                        self.selector_cache.record_success(cache_key, by, selector, j)
+                    return True
+                except Exception as click_error:
+                    print(f"⚠️ Click method {j + 1} failed: {click_error}")
+                    continue
+            
+            if self.selector_cache:
+                self.selector_cache.record_failure(cache_key, by, selector)
         
         print(f"❌ All selectors failed for {description}")
         return False
@@ -133,19 +449,29 @@ class DeltaFlightAutomationAdvanced:
         """
         Smart function to send keys to elements with multiple selector fallbacks
         """
-        for i, (by, selector) in enumerate(selectors, 1):
+        cache_key = entry_key(description, selectors)
+        remaining = self.selector_cache.order(cache_key, selectors) if self.selector_cache else list(range(len(selectors)))
+        deadline = time.time() + self.cap(5 * len(selectors))
+        
+        while remaining:
+            match = self.waits.first_match([selectors[i] for i in remaining], timeout=max(0, deadline - time.time()))
+            if not match:
+                break
+            i = remaining.pop(match[0])
+            element = match[1]
+            
             try:
-                element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((by, selector))
-                )
-                
                 element.clear()
                 element.send_keys(text)
-                print(f"✅ Successfully sent '{text}' to {description} using selector {i}")
+                print(f"✅ Successfully sent '{text}' to {description} using selector {i + 1}")
+                if self.selector_cache:
+                    self.selector_cache.record_success(cache_key, *selectors[i])
                 return True
                 
             except Exception as e:
-                print(f"⚠️ Selector {i} failed for {description}: {e}")
+                print(f"⚠️ Selector {i + 1} failed for {description}: {e}")
+                if self.selector_cache:
+                    self.selector_cache.record_failure(cache_key, *selectors[i])
                 continue
         
         print(f"❌ All selectors failed for {description}")
@@ -155,10 +481,11 @@ class DeltaFlightAutomationAdvanced:
         """Navigate to Delta flight search page"""
         try:
             print("🔄 Navigating to Delta flight search...")
+            self.driver.set_page_load_timeout(max(1, self.cap(30)))
             self.driver.get("https://www.delta.com/")
             
             # Wait for page to load completely
-            WebDriverWait(self.driver, 30).until(
+            WebDriverWait(self.driver, self.cap(30)).until(
                 lambda driver: driver.execute_script("return document.readyState") == "complete"
             )
             # time.sleep(3)  # Additional wait for dynamic content
@@ -176,7 +503,7 @@ class DeltaFlightAutomationAdvanced:
             #     lambda driver: driver.execute_script("return document.readyState") == "complete"
             # )
             
-            time.sleep(5)  # Additional wait for dynamic content
+            self.wait_for_angular(5)  # Wait for idp-root to finish bootstrapping (at most 5s)
             print("✅ Successfully navigated to Delta website")
             return True
             
@@ -184,6 +511,29 @@ class DeltaFlightAutomationAdvanced:
             print(f"❌ Failed to navigate to Delta website: {e}")
             return False
     
+    def start_navigation(self):
+        """Start loading the Delta home page without waiting for it (see navigation_ready)"""
+        try:
+            # The marker lives on the old document, so its absence means the new one is in
+            self.driver.execute_script(
+                "window.__deltaNavigationPending = true; window.location.href = arguments[0];",
+                "https://www.delta.com/"
+            )
+            return True
+        except Exception as e:
+            print(f"❌ Failed to start navigation to Delta website: {e}")
+            return False
+    
+    def navigation_ready(self):
+        """Whether a navigation started by start_navigation has reached the booking widget"""
+        try:
+            loaded = self.driver.execute_script(
+                "return document.readyState === 'complete' && !window.__deltaNavigationPending;"
+            )
+        except Exception:
+            return False
+        return bool(loaded) and self._holds(lambda: self._form_field_text("from"))
+    
     def select_from_airport(self, airport_code):
         """Select departure airport with multiple selector strategies"""
         try:
@@ -198,11 +548,6 @@ class DeltaFlightAutomationAdvanced:
                 # (By.XPATH, "//a[1][contains(@class, 'airport')]")
             ]
             
-            if not self.smart_wait_and_click(from_selectors, description="From airport field"):
-                return False
-            
-            time.sleep(2)
-            
             # Multiple selectors for input field
             input_selectors = [
                 # (By.XPATH, "//input[@type='text']"),
@@ -212,11 +557,6 @@ class DeltaFlightAutomationAdvanced:
                 # (By.XPATH, "//input[contains(@class, 'airport')]")
             ]
             
-            if not self.smart_send_keys(input_selectors, airport_code, "airport input"):
-                return False
-            
-            time.sleep(2)
-            
             # Multiple selectors for first suggestion
             suggestion_selectors = [
                 # (By.XPATH, "//li[1]"),
@@ -226,6 +566,21 @@ class DeltaFlightAutomationAdvanced:
                 # (By.XPATH, "//div[contains(@class, 'airport-option')][1]")
             ]
             
+            phase = form_batch.airport_phase(from_selectors, input_selectors, suggestion_selectors, airport_code)
+            if self.run_form_phase(phase, "departure airport"):
+                print(f"✅ Successfully selected departure airport: {airport_code}")
+                return True
+            
+            if not self.smart_wait_and_click(from_selectors, description="From airport field"):
+                return False
+            
+            self.wait_for_angular(2, fallback_idle_ms=300)  # Airport lookup modal
+            
+            if not self.smart_send_keys(input_selectors, airport_code, "airport input"):
+                return False
+            
+            self.wait_for_angular(2, fallback_idle_ms=300)  # Airport suggestions XHR
+            
             if not self.smart_wait_and_click(suggestion_selectors, description="first airport suggestion"):
                 return False
             
@@ -250,12 +605,7 @@ class DeltaFlightAutomationAdvanced:
                 (By.XPATH, "//a[2][contains(@class, 'airport')]")
             ]
             
-            if not self.smart_wait_and_click(to_selectors, description="To airport field"):
-                return False
-            
-            time.sleep(2)
-            
-            # Reuse input selectors
+            # Airport input selectors
             input_selectors = [
                 # (By.XPATH, "//input[@type='text']"),
                 # (By.XPATH, "//input[contains(@placeholder, 'airport')]"),
@@ -263,11 +613,6 @@ class DeltaFlightAutomationAdvanced:
                 (By.CSS_SELECTOR, "input[type='text']")
             ]
             
-            if not self.smart_send_keys(input_selectors, airport_code, "airport input"):
-                return False
-            
-            time.sleep(2)
-            
             # Multiple selectors for suggestion click
             suggestion_selectors = [
                 # (By.XPATH, "//li[1]"),
@@ -276,6 +621,21 @@ class DeltaFlightAutomationAdvanced:
                 (By.CSS_SELECTOR, "li:first-child")
             ]
             
+            phase = form_batch.airport_phase(to_selectors, input_selectors, suggestion_selectors, airport_code)
+            if self.run_form_phase(phase, "destination airport"):
+                print(f"✅ Successfully selected destination airport: {airport_code}")
+                return True
+            
+            if not self.smart_wait_and_click(to_selectors, description="To airport field"):
+                return False
+            
+            self.wait_for_angular(2, fallback_idle_ms=300)  # Airport lookup modal
+            
+            if not self.smart_send_keys(input_selectors, airport_code, "airport input"):
+                return False
+            
+            self.wait_for_angular(2, fallback_idle_ms=300)  # Airport suggestions XHR
+            
             if not self.smart_wait_and_click(suggestion_selectors, description="first airport suggestion"):
                 return False
             
@@ -299,11 +659,6 @@ class DeltaFlightAutomationAdvanced:
                 (By.XPATH, "/html/body/idp-root/ngc-global-nav/header/div/div[1]/ngc-book/div[1]/div/form/div[1]/div/div[1]/div[1]/div[2]")
             ]
             
-            if not self.smart_wait_and_click(dropdown_selectors, description="trip type dropdown"):
-                return False
-            
-            time.sleep(1)
-            
             # Trip type option selectors
             trip_options = {
                 "round_trip": [
@@ -323,6 +678,17 @@ class DeltaFlightAutomationAdvanced:
                 ]
             }
             
+            if trip_type in trip_options:
+                phase = form_batch.trip_type_phase(dropdown_selectors, trip_options[trip_type])
+                if self.run_form_phase(phase, "trip type"):
+                    print(f"✅ Successfully selected trip type: {trip_type}")
+                    return True
+            
+            if not self.smart_wait_and_click(dropdown_selectors, description="trip type dropdown"):
+                return False
+            
+            self.settle_dom(1)
+            
             if trip_type in trip_options:
                 if not self.smart_wait_and_click(trip_options[trip_type], description=f"{trip_type} option"):
                     return False
@@ -336,18 +702,18 @@ class DeltaFlightAutomationAdvanced:
     
     def select_departure_date(self, date_str="09/24/25"):
         """Select departure date with advanced calendar navigation"""
+        print(f"🔄 Selecting departure date: {date_str}")
+        
+        if not self.open_departure_calendar():
+            return False
+        
+        self.wait_until(self.calendar_ready, timeout=3)
+        
+        return self.pick_departure_date(date_str)
+    
+    def open_departure_calendar(self):
+        """Click the departure date field to open the calendar"""
         try:
-            print(f"🔄 Selecting departure date: {date_str}")
-            
-            # Parse the date
-            date_obj = datetime.strptime(date_str, "%m/%d/%y")
-            target_day = date_obj.day
-            target_month = date_obj.month
-            target_year = date_obj.year
-            target_date_formatted = date_obj.strftime("%m/%d/%Y")
-            
-            print(f"📅 Target date: Day={target_day}, Month={target_month}, Year={target_year}")
-            
             # Date field selectors
             date_selectors = [
                 (By.XPATH, "/html/body/idp-root/ngc-global-nav/header/div/div[1]/ngc-book/div[1]/div/form/div[1]/div/div[1]/div[1]/div[3]/date-selection-view"),
@@ -356,14 +722,43 @@ class DeltaFlightAutomationAdvanced:
                 (By.XPATH, "//input[contains(@placeholder, 'Depart')]")
             ]
             
-            if not self.smart_wait_and_click(date_selectors, description="departure date field"):
-                return False
+            phase = form_batch.calendar_phase(date_selectors, CALENDAR_HEADER_SELECTORS)
+            if self.run_form_phase(phase, "calendar open"):
+                return True
             
-            time.sleep(3)
+            return self.smart_wait_and_click(date_selectors, description="departure date field")
+            
+        except Exception as e:
+            print(f"❌ Failed to open departure calendar: {e}")
+            return False
+    
+    def calendar_ready(self):
+        """Non-blocking check that the date picker has rendered"""
+        try:
+            return bool(self.driver.find_elements(By.CSS_SELECTOR, ", ".join(selector for _, selector in CALENDAR_HEADER_SELECTORS)))
+        except Exception:
+            return False
+    
+    def pick_departure_date(self, date_str="09/24/25"):
+        """Pick the date in an already open calendar and confirm with Done"""
+        try:
+            # Parse the date
+            date_obj = datetime.strptime(date_str, "%m/%d/%y")
+            target_day = date_obj.day
+            target_month = date_obj.month
+            target_year = date_obj.year
+            target_date_formatted = date_obj.strftime("%m/%d/%Y")
+            
+            print(f"📅 Target date: Day={target_day}, Month={target_month}, Year={target_year}")
             
             # Try multiple approaches to select the date
             success = False
             
+            # Approach 0: Read the shown month once and jump straight to the target
+            print("🔍 Approach 0: Trying direct month jump...")
+            if self._jump_to_date(date_obj):
+                success = True
+            
             # Approach 1: Try Delta-specific date picker with data-date attribute
             # print("🔍 Approach 1: Trying Delta date picker with data-date...")
             # if self._select_date_by_data_attribute(target_date_formatted, target_day):
@@ -385,7 +780,7 @@ class DeltaFlightAutomationAdvanced:
                 print("❌ All date selection approaches failed")
                 return False
             
-            time.sleep(1)
+            self.settle_dom(1)
             
             # Click Done button
             done_selectors = [
@@ -418,7 +813,7 @@ class DeltaFlightAutomationAdvanced:
             
             for selector in selectors:
                 try:
-                    element = WebDriverWait(self.driver, 2).until(
+                    element = WebDriverWait(self.driver, self.cap(2)).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     element.click()
@@ -434,9 +829,23 @@ class DeltaFlightAutomationAdvanced:
             print(f"⚠️ Data attribute approach failed: {e}")
             return False
     
+    def _jump_to_date(self, date_obj):
+        """Select a date by advancing the calendar the exact number of months in one scripted burst"""
+        header_css = ", ".join(selector for _, selector in CALENDAR_HEADER_SELECTORS)
+        result = form_batch.jump_to_date(self.driver, date_obj, header_css, ", ".join(CALENDAR_NEXT_SELECTORS), timeout=self.cap(5))
+        if result.get("ok"):
+            print(f"✅ Jumped {result.get('advances', 0)} month(s) from {result.get('shown') or 'current view'} "
+                  f"and selected {date_obj.strftime('%m/%d/%Y')} in {result.get('elapsed_ms', 0)}ms")
+            return True
+        print(f"⚠️ Direct month jump failed: {result.get('error')}")
+        return False
+    
     def _navigate_and_select_by_data_attribute(self, target_date_formatted, target_day, max_attempts=12):
         """Navigate through months to find the target date"""
         try:
+            if self._jump_to_date(datetime.strptime(target_date_formatted, "%m/%d/%Y")):
+                return True
+            
             for attempt in range(max_attempts):
                 # Try to find the date in current month view
                 selectors = [
@@ -446,7 +855,7 @@ class DeltaFlightAutomationAdvanced:
                 
                 for selector in selectors:
                     try:
-                        element = WebDriverWait(self.driver, 1).until(
+                        element = WebDriverWait(self.driver, self.cap(1)).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                         )
                         element.click()
@@ -467,11 +876,11 @@ class DeltaFlightAutomationAdvanced:
                 navigated = False
                 for next_selector in next_selectors:
                     try:
-                        next_button = WebDriverWait(self.driver, 1).until(
+                        next_button = WebDriverWait(self.driver, self.cap(1)).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, next_selector))
                         )
                         next_button.click()
-                        time.sleep(0.5)
+                        self.settle_dom(0.5, quiet_ms=100)
                         navigated = True
                         break
                     except TimeoutException:
@@ -501,7 +910,7 @@ class DeltaFlightAutomationAdvanced:
             current_month_element = None
             for selector in month_year_selectors:
                 try:
-                    current_month_element = WebDriverWait(self.driver, 2).until(
+                    current_month_element = WebDriverWait(self.driver, self.cap(2)).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                     )
                     break
@@ -527,7 +936,7 @@ class DeltaFlightAutomationAdvanced:
                     try:
                         # Convert CSS selector to XPath for text matching
                         xpath_selector = f"//td[contains(@class, 'available')]//a[text()='{target_day}'] | //button[text()='{target_day}'] | //a[text()='{target_day}']"
-                        element = WebDriverWait(self.driver, 1).until(
+                        element = WebDriverWait(self.driver, self.cap(1)).until(
                             EC.element_to_be_clickable((By.XPATH, xpath_selector))
                         )
                         element.click()
@@ -537,20 +946,16 @@ class DeltaFlightAutomationAdvanced:
                         continue
                 
                 # Navigate to next month
-                next_selectors = [
-                    "button[aria-label*='next' i]",
-                    ".dl-datepicker-next",
-                    "button[class*='next']"
-                ]
+                next_selectors = CALENDAR_NEXT_SELECTORS
                 
                 navigated = False
                 for next_selector in next_selectors:
                     try:
-                        next_button = WebDriverWait(self.driver, 1).until(
+                        next_button = WebDriverWait(self.driver, self.cap(1)).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, next_selector))
                         )
                         next_button.click()
-                        time.sleep(0.5)
+                        self.settle_dom(0.5, quiet_ms=100)
                         navigated = True
                         break
                     except TimeoutException:
@@ -634,7 +1039,7 @@ class DeltaFlightAutomationAdvanced:
             if not self.smart_wait_and_click(date_selectors, description="departure date field"):
                 return False
             
-            time.sleep(3)
+            self.wait_until(self.calendar_ready, timeout=3)
             
             # Find the first available date and click it
             today = datetime.now()
@@ -654,7 +1059,7 @@ class DeltaFlightAutomationAdvanced:
                 print("❌ All strategies failed to find available date")
                 return False
             
-            time.sleep(1)
+            self.settle_dom(1)
             
             # Click Done button
             done_selectors = [
@@ -754,7 +1159,7 @@ class DeltaFlightAutomationAdvanced:
                 
                 for xpath in xpath_selectors:
                     try:
-                        element = WebDriverWait(self.driver, 0.5).until(
+                        element = WebDriverWait(self.driver, self.cap(0.5)).until(
                             EC.element_to_be_clickable((By.XPATH, xpath))
                         )
                         element.click()
@@ -791,63 +1196,164 @@ class DeltaFlightAutomationAdvanced:
             print(f"❌ Failed to initiate search: {e}")
             return False
     
+    def mark_previous_results(self):
+        """Flag the results on screen so results_ready waits for the next search's results"""
+        try:
+            self.driver.execute_script(
+                "document.querySelectorAll(arguments[0]).forEach(function (el) { el.setAttribute('data-prev-search', '1'); });",
+                ", ".join(RESULT_SELECTORS)
+            )
+        except Exception:
+            pass
+    
+    def search_by_deep_link(self, from_airport, to_airport, trip_type, date, timeout=20):
+        """Open the search results URL directly; False if Delta rejects the link"""
+        try:
+            url = build_search_url(from_airport, to_airport, date, trip_type)
+            print(f"🔗 Opening deep link: {url}")
+            self.driver.set_page_load_timeout(max(1, self.cap(30)))
+            self.driver.get(url)
+            
+            if self.wait_until(self.results_ready, timeout=timeout):
+                print("✅ Deep link accepted")
+                return True
+            
+            print(f"⚠️ Deep link rejected (landed on {self.driver.current_url}), falling back to the booking form")
+            return False
+            
+        except Exception as e:
+            print(f"⚠️ Deep link search failed: {e}")
+            return False
+    
+    def results_ready(self):
+        """Non-blocking check for rendered flight results"""
+        try:
+            # Results left over from the previous search are marked and don't count
+            return bool(self.driver.find_elements(
+                By.CSS_SELECTOR, ", ".join(f"{selector}:not([data-prev-search])" for selector in RESULT_SELECTORS)
+            ))
+        except Exception:
+            return False
+    
     def wait_for_results(self, timeout=120):
         """Wait for flight results to load with multiple indicators"""
         try:
             print("🔄 Waiting for flight results...")
             
-            # Multiple selectors to detect results
-            result_selectors = [
-                "div.flight-results-grid",
-                "div[id*='flight-results']",
-                "[class*='flight-card']",
-                "[class*='flight-results']",
-                "div[class*='mach-flight-results-grid']"
-            ]
+            # Any of the result indicators, polled together for up to the timeout
+            if not self.wait_until(self.results_ready, timeout=timeout):
+                print(f"❌ No flight results found within {self.cap(timeout):.0f}s timeout")
+                return False
             
-            for selector in result_selectors:
-                try:
-                    element = WebDriverWait(self.driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if element:
-                        print(f"✅ Found results using selector: {selector}")
-                        time.sleep(5)  # Wait for full load
-                        return True
-                except TimeoutException:
-                    continue
+            for selector in RESULT_SELECTORS:
+                if self.driver.find_elements(By.CSS_SELECTOR, selector):
+                    print(f"✅ Found results using selector: {selector}")
+                    break
+            self.wait_for_angular(5, fallback_idle_ms=750)  # Wait for fares to finish loading
             
-            print("❌ No flight results found within timeout")
-            return False
+            # The offers response usually lands with the cards; give it a moment if not
+            if self.waits and self.waits.available and self.offer_capture.latest_offers() is None:
+                self.wait_until(lambda: self.offer_capture.latest_offers() is not None, timeout=5)
+            return True
                 
         except Exception as e:
             print(f"❌ Error waiting for results: {e}")
             return False
     
-    def dump_html(self, filename="flight_results.html"):
-        """Save current page HTML to file with error handling"""
+    def extract_flight_cards(self):
+        """Extract the rendered flight cards as compact JSON in one script call"""
+        result = extract_flights(self.driver)
+        print(f"✈️ Extracted {len(result['flights'])} flight(s) from {result['cards']} card(s) in {result['elapsed']:.2f}s")
+        return result["flights"]
+    
+    def save_flights(self, filename):
+        """Save the extracted flights and captured offers of the last search as JSON"""
         try:
-            # Create dumps directory
-            dumps_dir = "html_dumps"
-            os.makedirs(dumps_dir, exist_ok=True)
-            
-            filepath = os.path.join(dumps_dir, filename)
+            results_dir = "flight_results"
+            os.makedirs(results_dir, exist_ok=True)
             
-            # Get page source
-            html_content = self.driver.page_source
+            filepath = os.path.join(results_dir, filename)
+            record = {key: self.last_search.get(key) for key in ("params", "flights", "flights_price_tab", "offers")}
+            content = json.dumps(record, indent=2)
             
-            # Save with UTF-8 encoding
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            self.write_in_background(f"flights {filename}", self._write_file, filepath, content)
+            print(f"✅ Flights saved to: {filepath} ({len(content) / 1024:.1f} KB)")
+            return filepath
             
-            file_size = os.path.getsize(filepath) / 1024  # Size in KB
-            print(f"✅ HTML dumped successfully to: {filepath} ({file_size:.1f} KB)")
+        except Exception as e:
+            print(f"❌ Failed to save flights: {e}")
+            return None
+    
+    def dump_html(self, filename="flight_results.html", kind="flight_results"):
+        """Save current page HTML to the compressed dump store with error handling"""
+        try:
+            if self.dump_store is None:
+                self.dump_store = DumpStore()
+            
+            # Get page source; hashing is cheap, compression and disk I/O happen off-thread
+            html_content = self.driver.page_source.encode("utf-8")
+            digest = DumpStore.digest(html_content)
+            filepath = self.dump_store.locate(digest, "html")
+            
+            params = dict((self.last_search or {}).get("params", {}))
+            self.write_in_background(f"dump {filename}", self.dump_store.put, html_content, kind,
+                                     params=params, name=filename, digest=digest)
+            print(f"✅ HTML dumped to: {filepath} ({len(html_content) / 1024:.1f} KB)")
             return filepath
             
         except Exception as e:
             print(f"❌ Failed to dump HTML: {e}")
             return None
     
+    @staticmethod
+    def _write_file(filepath, content):
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+    
+    def write_in_background(self, description, func, *args, **kwargs):
+        """Queue a write on the background writer (runs inline when it is disabled)"""
+        if self.background_writes:
+            if self.writer is None or self.writer.closed:
+                self.writer = BackgroundWriter()
+            self.writer.submit(description, func, *args, **kwargs)
+        else:
+            func(*args, **kwargs)
+    
+    def flush_writes(self, timeout=None, stop=False):
+        """
+        Wait for queued dump/result writes, optionally stopping the writer thread
+        
+        Returns:
+            list: (description, error) of writes that failed since the last report
+        """
+        if not self.writer:
+            return []
+        if stop:
+            self.writer.close(timeout)
+        elif not self.writer.flush(timeout):
+            print(f"⚠️ {self.writer.pending()} background write(s) still pending")
+        new_errors = self.writer.errors[self.write_errors_reported:]
+        self.write_errors_reported = len(self.writer.errors)
+        if new_errors:
+            print(f"⚠️ {len(new_errors)} background write(s) failed")
+        if stop:
+            self.writer = None
+            self.write_errors_reported = 0
+        return new_errors
+    
+    def collect_offers(self):
+        """Store the captured gqlSearchOffers data in last_search"""
+        if not self.offer_capture:
+            return None
+        self.waits.pump()
+        self.last_search["offer_responses"] = [response["data"] for response in self.offer_capture.responses]
+        self.last_search["offers"] = self.offer_capture.latest_offers()
+        if self.last_search["offers"] is None:
+            print("⚠️ No gqlSearchOffers response captured for this search")
+        return self.last_search["offers"]
+    
     def click_price_tab(self):
         """Click on price tab with multiple strategies"""
         try:
@@ -866,7 +1372,7 @@ class DeltaFlightAutomationAdvanced:
                 return False
             
             # Wait for new content to load
-            time.sleep(5)
+            self.settle(5)
             
             print("✅ Successfully clicked price tab")
             return True
@@ -875,8 +1381,19 @@ class DeltaFlightAutomationAdvanced:
             print(f"❌ Failed to click price tab: {e}")
             return False
     
-    def run_automation(self, from_airport="DEL", to_airport="BCN", trip_type="one_way", date="09/24/25", use_next_available=True):
-        """Run the complete automation with comprehensive error handling"""
+    def run_automation(self, from_airport="DEL", to_airport="BCN", trip_type="one_way", date="09/24/25", use_next_available=True, skip_navigation=False, search_mode=None, budget=None, retries=0):
+        """
+        Run the complete automation with comprehensive error handling
+        
+        Args:
+            skip_navigation (bool): Browser is already on the booking widget
+                (e.g. a warm session handed out by DriverPool)
+            search_mode (str): Override the instance search_mode for this search
+            budget (float): Override the instance search_budget for this search
+            retries (int): Re-run failed steps this many times, resuming after the
+                last step whose post-condition still holds
+        """
+        search_mode = search_mode or self.search_mode
         try:
             print("🚀 Starting Enhanced Delta Flight Automation")
             print("=" * 60)
@@ -886,47 +1403,220 @@ class DeltaFlightAutomationAdvanced:
             print(f"   Trip Type: {trip_type}")
             print(f"   Date: {date}")
             print(f"   Use Next Available: {use_next_available}")
+            print(f"   Search Mode: {search_mode}")
             print("=" * 60)
             
-            steps = [
-                ("Navigate to Delta", lambda: self.navigate_to_delta()),
-                ("Select From Airport", lambda: self.select_from_airport(from_airport)),
-                ("Select To Airport", lambda: self.select_to_airport(to_airport)),
-                ("Select Trip Type", lambda: self.select_trip_type(trip_type)),
-                ("Select Departure Date", lambda: self._select_date_with_fallback(date, use_next_available)),
-                ("Search Flights", lambda: self.search_flights()),
-                ("Wait for Results", lambda: self.wait_for_results())
+            # A recycled browser starts on about:blank, so it must navigate
+            recycled = self.maybe_recycle()
+            if recycled:
+                skip_navigation = False
+            
+            # Every wait from here on is capped to what is left of this budget
+            self.deadline = SearchDeadline(budget or self.search_budget)
+            
+            if self.lifecycle == "context":
+                # A fresh context starts on about:blank, so always navigate
+                self.open_search_context()
+                skip_navigation = False
+            
+            params = {
+                "from_airport": from_airport,
+                "to_airport": to_airport,
+                "trip_type": trip_type,
+                "date": date
+            }
+            # Checkpoints only carry over for a retry of the same search in the same page
+            if recycled or self.lifecycle == "context" or not self.checkpoint or self.checkpoint["params"] != params:
+                self.checkpoint = {"params": params, "confirmed": []}
+            
+            # Consecutive search in the same page: the global-nav booking widget is
+            # still on screen (home or results page), so only changed fields are refilled
+            refill = (self.incremental_refill and self.form_state is not None and not recycled
+                      and self.lifecycle != "context" and search_mode == "form"
+                      and self._holds(lambda: self._form_field_text("from")))
+            if refill:
+                changed = [key for key in params if self.form_state.get(key) != params[key]]
+                print(f"♻️ Incremental refill from current page (changed: {', '.join(changed) or 'nothing'})")
+                skip_navigation = True
+                self.mark_previous_results()
+            self.form_state = None
+            
+            self.last_search = {
+                "params": params,
+                "search_mode": search_mode,
+                "refilled": refill,
+                "failed_step": None,
+                "step_timings": {},
+                "dumps": [],
+                "flights": [],
+                "offers": None,
+                "offer_responses": []
+            }
+            
+            # Events still queued from the previous search belong to it, not this one
+            if self.waits:
+                self.waits.pump()
+            if self.offer_capture:
+                self.offer_capture.reset()
+            
+            deep_linked = False
+            if search_mode == "deep_link":
+                print("\n🔄 Step: Deep Link Search")
+                self.apply_request_policy("Wait for Results")
+                step_start = time.time()
+                deep_linked = self.search_by_deep_link(from_airport, to_airport, trip_type, date)
+                self.last_search["step_timings"]["Deep Link Search"] = round(time.time() - step_start, 2)
+                if not deep_linked:
+                    # The rejected link left the widget page, so the form flow must navigate
+                    self.last_search["search_mode"] = "form"
+                    self.last_search["deep_link_rejected"] = True
+                    skip_navigation = False
+            
+            widget_shown = lambda: bool(self._form_field_text("from"))
+            navigations = []
+            
+            def navigate():
+                # The warm page is trusted only on the first run of this step and only while
+                # the widget is actually on screen; a retry always reloads the page
+                if skip_navigation and not navigations and self._holds(widget_shown):
+                    navigations.append("skipped")
+                    return True
+                navigations.append("navigated")
+                return self.navigate_to_delta()
+            
+            # (step name, action, post-condition that confirms the step still holds)
+            steps = [] if deep_linked else [
+                ("Navigate to Delta", navigate, widget_shown),
+                ("Select From Airport", lambda: self.select_from_airport(from_airport),
+                 lambda: airport_code(self._form_field_text("from")) == from_airport.upper()),
+                ("Select To Airport", lambda: self.select_to_airport(to_airport),
+                 lambda: airport_code(self._form_field_text("to")) == to_airport.upper()),
+                ("Select Trip Type", lambda: self.select_trip_type(trip_type),
+                 lambda: TRIP_TYPE_LABELS.get(trip_type, "") in self._form_field_text("trip_type").upper()),
+                ("Select Departure Date", lambda: self._select_date_with_fallback(date, use_next_available),
+                 lambda: self._date_field_shows(date)),
+                ("Search Flights", lambda: self.search_flights(),
+                 lambda: "search-results" in self.driver.current_url or self.results_ready())
             ]
+            steps.append(("Wait for Results", lambda: self.wait_for_results(), self.results_ready))
             
-            # Execute each step
-            for step_name, step_func in steps:
-                print(f"\n🔄 Step: {step_name}")
-                if not step_func():
-                    print(f"❌ Failed at step: {step_name}")
-                    return False
-                print(f"✅ Completed: {step_name}")
+            # Field steps are skipped when the widget already shows the requested value
+            prefilled = ("Select From Airport", "Select To Airport", "Select Trip Type", "Select Departure Date") if refill else ()
+            if not self._run_steps(steps, retries, prefilled):
+                return False
+            self.checkpoint = None
+            if not deep_linked:
+                self.form_state = params
             
             # Generate timestamp for file names
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            # Dump initial results
-            first_dump = f"flight_results_initial_{from_airport}_{to_airport}_{timestamp}.html"
-            self.dump_html(first_dump)
+            # Extract initial results (full HTML dump only when enabled for debugging)
+            self.last_search["flights"] = self.extract_flight_cards()
+            if self.save_html_dumps:
+                first_dump = f"flight_results_initial_{from_airport}_{to_airport}_{timestamp}.html"
+                self.last_search["dumps"].append(self.dump_html(first_dump, kind="flight_results_initial"))
             
-            # Try to click price tab and dump again
+            # Try to click price tab and extract again
+            self.apply_request_policy("Click Price Tab")
             if self.click_price_tab():
-                second_dump = f"flight_results_price_tab_{from_airport}_{to_airport}_{timestamp}.html"
-                self.dump_html(second_dump)
+                self.last_search["flights_price_tab"] = self.extract_flight_cards()
+                if self.save_html_dumps:
+                    second_dump = f"flight_results_price_tab_{from_airport}_{to_airport}_{timestamp}.html"
+                    self.last_search["dumps"].append(self.dump_html(second_dump, kind="flight_results_price_tab"))
+            
+            self.collect_offers()
+            self.last_search["results_file"] = self.save_flights(f"flights_{from_airport}_{to_airport}_{timestamp}.json")
             
             print("\n" + "=" * 60)
             print("🎉 AUTOMATION COMPLETED SUCCESSFULLY!")
-            print("📁 Check the 'html_dumps' folder for saved HTML files")
+            print("📁 Check the 'flight_results' folder for extracted flights")
+            if self.save_html_dumps:
+                print("📁 HTML dumps are in the 'dump_store' folder (python dump_store.py list)")
             print("=" * 60)
             return True
             
         except Exception as e:
             print(f"\n❌ Automation failed with error: {e}")
+            if self.last_search is not None:
+                self.last_search["error"] = str(e)
             return False
+        finally:
+            self.searches_served += 1
+            if self.last_search is not None:
+                self.last_search["elapsed"] = round(self.deadline.elapsed(), 2)
+            self.deadline = SearchDeadline(None)
+            if self.lifecycle == "context":
+                self.close_search_context()
+    
+    def _run_steps(self, steps, retries=0, prefilled=()):
+        """
+        Execute steps, recording a checkpoint for each confirmed post-condition
+        
+        Steps confirmed by an earlier attempt are skipped while their
+        post-conditions still hold, so a retry resumes where the last one broke.
+        Steps named in prefilled are skipped whenever their post-condition
+        already holds (form fields unchanged since the previous search).
+        """
+        for attempt in range(retries + 1):
+            if attempt:
+                print(f"\n🔁 Retry {attempt}/{retries}: resuming after the last confirmed step")
+            resuming = True
+            
+            for index, (step_name, step_func, post_condition) in enumerate(steps):
+                if step_name in prefilled and self._holds(post_condition):
+                    print(f"⏭️ Skipping {step_name}: field already matches")
+                    if step_name not in self.checkpoint["confirmed"]:
+                        self.checkpoint["confirmed"].append(step_name)
+                    continue
+                if resuming and step_name in self.checkpoint["confirmed"] and self._holds(post_condition):
+                    print(f"⏭️ Skipping {step_name}: post-condition still holds")
+                    continue
+                
+                # Everything after the first re-run step has to run again
+                resuming = False
+                self.checkpoint["confirmed"] = [name for name, _, _ in steps[:index] if name in self.checkpoint["confirmed"]]
+                
+                if self.deadline.expired():
+                    print(f"⏰ Search budget of {self.deadline.budget}s exhausted before step: {step_name}")
+                    self.last_search["failed_step"] = step_name
+                    self.last_search["error"] = "search budget exhausted"
+                    return False
+                print(f"\n🔄 Step: {step_name}")
+                self.apply_request_policy(step_name)
+                step_start = time.time()
+                step_ok = step_func()
+                self.last_search["step_timings"][step_name] = round(time.time() - step_start, 2)
+                if not step_ok:
+                    print(f"❌ Failed at step: {step_name}")
+                    self.last_search["failed_step"] = step_name
+                    break
+                if self._holds(post_condition):
+                    self.checkpoint["confirmed"].append(step_name)
+                print(f"✅ Completed: {step_name}")
+            else:
+                self.last_search["failed_step"] = None
+                return True
+        
+        return False
+    
+    def _holds(self, post_condition):
+        try:
+            return bool(post_condition())
+        except Exception:
+            return False
+    
+    def _form_field_text(self, field):
+        """Visible text of a booking widget field, or an empty string"""
+        match = self.waits.first_match(FORM_FIELD_SELECTORS[field], timeout=0) if self.waits else None
+        if not match:
+            return ""
+        return (match[1].text or match[1].get_attribute("textContent") or "").strip()
+    
+    def _date_field_shows(self, date_str):
+        """Whether the departure field shows exactly the requested date (year included)"""
+        date_obj = datetime.strptime(date_str, "%m/%d/%y").date()
+        return parse_widget_date(self._form_field_text("date")) == date_obj
     
     def _select_date_with_fallback(self, date, use_next_available):
         """Select date with fallback to next available date"""
@@ -946,18 +1636,153 @@ class DeltaFlightAutomationAdvanced:
             print(f"❌ Date selection with fallback failed: {e}")
             return False
     
-    def close(self):
-        """Close browser with cleanup"""
+    def is_alive(self):
+        """Check whether the browser session still responds"""
+        try:
+            return self.driver is not None and bool(self.driver.window_handles)
+        except Exception:
+            return False
+    
+    def _rss_unavailable(self, reason):
+        if not self.rss_warning_shown:
+            print(f"⚠️ {reason}, so RSS-based recycling is disabled")
+            self.rss_warning_shown = True
+        return None
+    
+    def driver_rss_mb(self):
+        """Resident memory of the chromedriver + Chrome process tree in MB, or None"""
+        try:
+            pid = self.driver.service.process.pid
+        except Exception:
+            return None
+        rss = process_tree_rss(pid)
+        if rss is None:
+            return self._rss_unavailable("Browser memory cannot be measured here (pip install psutil)")
+        
+        # An attached Chrome is not a child of chromedriver: measure the daemon's
+        # recorded Chrome pid tree instead
+        if self.attached_port is not None:
+            from chrome_daemon import instance_pid
+            chrome_pid = instance_pid(self.attached_port)
+            if not chrome_pid:
+                return self._rss_unavailable(f"Chrome on port {self.attached_port} was not started by "
+                                             f"chrome_daemon.py; its memory cannot be measured")
+            chrome_rss = process_tree_rss(chrome_pid)
+            if chrome_rss is None:
+                return self._rss_unavailable(f"Memory of the daemon Chrome on port {self.attached_port} cannot be measured")
+            rss += chrome_rss
+        
+        return rss / 1024 / 1024
+    
+    def maybe_recycle(self):
+        """
+        Relaunch the browser between searches when the recycle policy says so
+        
+        Returns:
+            bool: True if the driver was recycled
+        """
+        if not self.recycle_policy or not self.driver:
+            return False
+        
+        rss_mb = self.driver_rss_mb()
+        reason = self.recycle_policy.check(self.searches_served, rss_mb)
+        if not reason:
+            return False
+        
+        event = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "reason": reason,
+            "searches_served": self.searches_served,
+            "rss_mb": round(rss_mb, 1) if rss_mb is not None else None
+        }
+        self.recycle_events.append(event)
+        print(f"♻️ Recycling browser: {reason}")
+        
+        attached_port = self.attached_port
+        self.close(recycling=True)
+        if attached_port is not None:
+            # Re-attaching alone would hand back the same bloated Chrome
+            from chrome_daemon import instance_pid, restart_instance
+            if instance_pid(attached_port):
+                print(f"♻️ Asking chrome_daemon.py to restart the instance on port {attached_port}...")
+                restart_instance(attached_port)
+            else:
+                print(f"⚠️ Chrome on port {attached_port} is not a daemon instance; only the driver is recycled")
+        self.setup_driver(self.headless)
+        self.searches_served = 0
+        
+        new_rss = self.driver_rss_mb()
+        event["rss_after_mb"] = round(new_rss, 1) if new_rss is not None else None
+        print(f"♻️ Browser recycled ({event['rss_mb']} MB -> {event['rss_after_mb']} MB)")
+        return True
+    
+    def can_refill(self):
+        """Whether the next search can refill the form on the current page (no reset needed)"""
+        return self.incremental_refill and self.form_state is not None
+    
+    def reset_for_next_search(self):
+        """Return a used session to a clean booking widget without relaunching Chrome"""
+        try:
+            print("🔄 Resetting browser session for next search...")
+            
+            # Close any extra tabs/popups left behind by the previous search
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            
+            # Drop the per-tab booking state so the widget comes back empty
+            try:
+                self.driver.execute_script("window.sessionStorage.clear();")
+            except Exception:
+                pass
+            
+            self.apply_request_policy("Navigate to Delta")
+            return self.navigate_to_delta()
+            
+        except Exception as e:
+            print(f"❌ Failed to reset browser session: {e}")
+            return False
+    
+    def release_lease(self):
+        """Give a leased chrome_daemon.py instance back to other bots"""
+        if self.leased_port is not None:
+            from chrome_daemon import release_lease
+            release_lease(self.leased_port)
+            self.leased_port = None
+    
+    def close(self, recycling=False):
+        """
+        Close browser with cleanup (an attached daemon Chrome keeps running)
+        
+        Args:
+            recycling (bool): A new browser follows right away, so pending writes are
+                only flushed and a leased daemon instance is kept
+        """
+        self.flush_writes(stop=not recycling)
         try:
             if self.driver:
+                self.close_search_context()
+                if self.request_policy:
+                    self.request_policy.forget(self.driver)
                 self.driver.quit()
                 print("✅ Browser closed successfully")
         except Exception as e:
             print(f"⚠️ Error closing browser: {e}")
+        finally:
+            if not recycling:
+                self.release_lease()
 
 
 def main():
     """Main function with user-friendly configuration"""
+    # Farm mode: python delta_flight_automation_advanced.py --farm searches.json [workers]
+    if len(sys.argv) > 2 and sys.argv[1] == "--farm":
+        from search_farm import main as farm_main
+        farm_main(sys.argv[2:])
+        return
+    
     print("🛫 Delta Flight Search Automation")
     print("=" * 50)
     
@@ -1,10 +1,56 @@
 // Delta Flight Search API fetcher using Scrappey.com
 const Scrappey = require('scrappey-wrapper');
 const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const crypto = require('crypto');
 
 // Initialize Scrappey with your API key
 const scrappey = new Scrappey('CPLgrNtC9kgMlgvBpMLydXJU3wIYVhD9bvxKn0ZO8SRWPNJvpgu4Ezhwki1U');
 
+// Compressed content-addressed dump store, same layout as dump_store.py
+const DUMP_STORE_DIR = path.join(__dirname, 'dump_store');
+
+// Search dates are stored as ISO (YYYY-MM-DD) whatever format the caller used
+function normalizeDate(value) {
+    if (typeof value !== 'string') return value;
+    let m = value.match(/^(\d{4})-(\d{2})-(\d{2})$/);
+    if (m) return value;
+    m = value.match(/^(\d{1,2})[\/-](\d{1,2})[\/-](\d{2}|\d{4})$/);
+    if (!m) return value;
+    const year = m[3].length === 2 ? `20${m[3]}` : m[3];
+    return `${year}-${m[1].padStart(2, '0')}-${m[2].padStart(2, '0')}`;
+}
+
+function storeDump(content, kind, params, ext, name) {
+    const data = Buffer.from(content, 'utf-8');
+    const hash = crypto.createHash('sha256').update(data).digest('hex');
+    const dir = path.join(DUMP_STORE_DIR, 'blobs', hash.slice(0, 2));
+    fs.mkdirSync(dir, { recursive: true });
+
+    const existing = fs.readdirSync(dir).find(f => f.startsWith(hash + '.') && !f.endsWith('.tmp'));
+    let blobPath = existing ? path.join(dir, existing) : path.join(dir, `${hash}.${ext}.gz`);
+    if (!existing) {
+        const tmpPath = `${blobPath}.${process.pid}.tmp`;
+        fs.writeFileSync(tmpPath, zlib.gzipSync(data, { level: 6 }));
+        fs.renameSync(tmpPath, blobPath);
+    }
+
+    const entry = {
+        hash,
+        kind,
+        params: Object.assign({}, params, params && 'date' in params ? { date: normalizeDate(params.date) } : {}),
+        name: name || null,
+        path: path.relative(DUMP_STORE_DIR, blobPath),
+        size: data.length,
+        stored_size: fs.statSync(blobPath).size,
+        deduplicated: Boolean(existing),
+        stored_at: new Date().toISOString().replace(/\.\d{3}Z$/, '+00:00')  // UTC, as in dump_store.py
+    };
+    fs.appendFileSync(path.join(DUMP_STORE_DIR, 'index.jsonl'), JSON.stringify(entry) + '\n');
+    return entry;
+}
+
 // Default Delta GraphQL query and variables
 const deltaGraphQLPayload = {
     variables: {
@@ -248,8 +294,9 @@ async function fetchDeltaFlightData(fromAirport = "MCO", toAirport = "BCN", depa
             // Dump raw response for debugging
             const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
             const rawFilename = `delta_raw_response_error_${timestamp}.txt`;
-            fs.writeFileSync(rawFilename, String(responseData));
-            console.log(`💾 Raw response saved to: ${rawFilename}`);
+            const rawEntry = storeDump(String(responseData), 'scrappey_raw_error',
+                { from_airport: fromAirport, to_airport: toAirport, date: departureDate }, 'txt', rawFilename);
+            console.log(`💾 Raw response saved to: dump_store/${rawEntry.path}`);
             
             throw new Error(`Failed to parse JSON response: ${parseError.message}`);
         }
@@ -259,8 +306,9 @@ async function fetchDeltaFlightData(fromAirport = "MCO", toAirport = "BCN", depa
         const filename = `delta_flights_${fromAirport}_${toAirport}_${departureDate}_page${pageNum}_${timestamp}.json`;
         
         // Save the JSON response
-        fs.writeFileSync(filename, JSON.stringify(jsonData, null, 2));
-        console.log(`💾 Delta flight data saved to: ${filename}`);
+        const entry = storeDump(JSON.stringify(jsonData), 'gql_offers',
+            { from_airport: fromAirport, to_airport: toAirport, date: departureDate, page: pageNum }, 'json', filename);
+        console.log(`💾 Delta flight data saved to: dump_store/${entry.path}${entry.deduplicated ? ' (deduplicated)' : ''}`);
         
         // Analyze the response
         analyzeDeltaFlightResponse(jsonData, fromAirport, toAirport, departureDate);
@@ -402,8 +450,9 @@ async function fetchMultiplePages(fromAirport = "MCO", toAirport = "BCN", depart
         results: allResults
     };
     
-    fs.writeFileSync(combinedFilename, JSON.stringify(combinedData, null, 2));
-    console.log(`\n💾 Combined results saved to: ${combinedFilename}`);
+    const combinedEntry = storeDump(JSON.stringify(combinedData), 'gql_offers_combined',
+        { from_airport: fromAirport, to_airport: toAirport, date: departureDate }, 'json', combinedFilename);
+    console.log(`\n💾 Combined results saved to: dump_store/${combinedEntry.path}`);
     
     return combinedData;
 }
@@ -6,15 +6,17 @@ for Delta's dynamic UI elements.
 """
 
 import requests
-import json
 import argparse
 from datetime import datetime
 import time
+import os
+from dump_store import DumpStore
 
 class DeltaScrappeyBrowserWorkflowEnhanced:
     def __init__(self):
         self.scrappey_key = "CPLgrNtC9kgMlgvBpMLydXJU3wIYVhD9bvxKn0ZO8SRWPNJvpgu4Ezhwki1U"
         self.scrappey_url = "https://publisher.scrappey.com/api/v1"
+        self.dump_store = DumpStore()
         
     def create_delta_workflow_robust(self, from_airport="DEL", to_airport="BCN", departure_date="08/21/2025", trip_type="ONE_WAY"):
         """
@@ -394,16 +396,16 @@ class DeltaScrappeyBrowserWorkflowEnhanced:
     
     def save_results(self, result, from_airport, to_airport, departure_date):
         """
-        Save results with detailed metadata
+        Save results with detailed metadata to the compressed dump store
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             # Save HTML
             filename = f"delta_scrappey_{result['workflow'].lower()}_{from_airport}_{to_airport}_{departure_date.replace('/', '-')}_{timestamp}.html"
+            params = {"from_airport": from_airport, "to_airport": to_airport, "date": departure_date}
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(result["html"])
+            entry = self.dump_store.put(result["html"], f"scrappey_{result['workflow'].lower()}", params=params, name=filename)
             
             # Create metadata
             metadata = {
@@ -418,7 +420,8 @@ class DeltaScrappeyBrowserWorkflowEnhanced:
                     "success": result["success"],
                     "status": result.get("status"),
                     "execution_time": result.get("execution_time", 0),
-                    "html_length": len(result["html"])
+                    "html_length": len(result["html"]),
+                    "html_hash": entry["hash"]
                 },
                 "analysis": {
                     "has_delta_branding": "delta" in result["html"].lower(),
@@ -430,12 +433,12 @@ class DeltaScrappeyBrowserWorkflowEnhanced:
             
             # Save metadata
             meta_filename = f"delta_scrappey_metadata_{timestamp}.json"
-            with open(meta_filename, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            meta_entry = self.dump_store.put_json(metadata, "scrappey_metadata", params=params, name=meta_filename)
             
             print(f"💾 Results saved:")
-            print(f"   📄 HTML: {filename} ({len(result['html']):,} chars)")
-            print(f"   📋 Metadata: {meta_filename}")
+            print(f"   📄 HTML: {os.path.join(self.dump_store.root, entry['path'])} ({len(result['html']):,} chars"
+                  f"{', deduplicated' if entry['deduplicated'] else ''})")
+            print(f"   📋 Metadata: {os.path.join(self.dump_store.root, meta_entry['path'])}")
             
             return True
             
@@ -6,15 +6,17 @@ and return the complete raw HTML response.
 """
 
 import requests
-import json
 import argparse
 from datetime import datetime
 import time
+import os
+from dump_store import DumpStore
 
 class DeltaScrappeyBrowserWorkflow:
     def __init__(self):
         self.scrappey_key = "CPLgrNtC9kgMlgvBpMLydXJU3wIYVhD9bvxKn0ZO8SRWPNJvpgu4Ezhwki1U"
         self.scrappey_url = "https://publisher.scrappey.com/api/v1"
+        self.dump_store = DumpStore()
         
     def create_delta_workflow(self, from_airport="DEL", to_airport="BCN", departure_date="08/21/2025", trip_type="ONE_WAY"):
         """
@@ -298,7 +300,7 @@ class DeltaScrappeyBrowserWorkflow:
     
     def save_results(self, result, from_airport, to_airport, departure_date):
         """
-        Save the HTML results to files
+        Save the HTML results and summary to the compressed dump store
         """
         try:
             if not result.get("success"):
@@ -307,12 +309,13 @@ class DeltaScrappeyBrowserWorkflow:
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"delta_scrappey_results_{from_airport}_{to_airport}_{departure_date.replace('/', '-')}_{timestamp}.html"
+            params = {"from_airport": from_airport, "to_airport": to_airport, "date": departure_date}
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(result["html"])
+            entry = self.dump_store.put(result["html"], "scrappey_results", params=params, name=filename)
             
-            print(f"💾 Results saved to: {filename}")
-            print(f"📊 File size: {len(result['html'])} characters")
+            print(f"💾 Results saved to: {os.path.join(self.dump_store.root, entry['path'])}")
+            print(f"📊 File size: {len(result['html'])} characters ({entry['stored_size']} bytes stored"
+                  f"{', deduplicated' if entry['deduplicated'] else ''})")
             
             # Also save a summary
             summary_filename = f"delta_scrappey_summary_{timestamp}.json"
@@ -326,14 +329,14 @@ class DeltaScrappeyBrowserWorkflow:
                     "success": result["success"],
                     "status": result.get("status"),
                     "html_length": len(result["html"]),
+                    "html_hash": entry["hash"],
                     "timestamp": timestamp
                 }
             }
             
-            with open(summary_filename, 'w') as f:
-                json.dump(summary, f, indent=2)
+            summary_entry = self.dump_store.put_json(summary, "scrappey_summary", params=params, name=summary_filename)
             
-            print(f"📋 Summary saved to: {summary_filename}")
+            print(f"📋 Summary saved to: {os.path.join(self.dump_store.root, summary_entry['path'])}")
             return True
             
         except Exception as e:
@@ -0,0 +1,156 @@
+"""
+Warm Chrome Session Pool for Delta Flight Automation
+====================================================
+Keeps N initialized DeltaFlightAutomationAdvanced sessions alive so that
+searches skip the Chrome + chromedriver launch and start on the booking widget.
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from delta_flight_automation_advanced import DeltaFlightAutomationAdvanced
+
+# Queued in place of a session whose replacement failed, so the slot is retried
+# by the next acquire() instead of being lost
+_RELAUNCH = None
+
+
+class DriverPool:
+    def __init__(self, size=2, headless=True, timeout=30, use_proxy=True, acquire_timeout=300, lifecycle="process"):
+        """
+        Initialize the pool and warm up all sessions
+
+        Args:
+            size (int): Number of Chrome sessions to keep alive
+            headless (bool): Run browsers in headless mode
+            timeout (int): Default timeout passed to each session
+            use_proxy (bool): Use proxy server for requests
+            acquire_timeout (int): Seconds to wait for a free session
+            lifecycle (str): "context" isolates every search in its own CDP browser context
+        """
+        self.size = size
+        self.session_kwargs = {"headless": headless, "timeout": timeout, "use_proxy": use_proxy, "lifecycle": lifecycle}
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.Queue()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        print(f"🔄 Warming up driver pool with {size} Chrome session(s)...")
+        for _ in range(size):
+            self._idle.put(self._new_session())
+        print(f"✅ Driver pool ready ({size} warm session(s))")
+
+    def _new_session(self, attempts=2):
+        """Launch a new session and park it on the booking widget"""
+        session = DeltaFlightAutomationAdvanced(**self.session_kwargs)
+        # Pooled searches skip navigation, so a session that never reached the widget is useless
+        for attempt in range(attempts):
+            if session.navigate_to_delta():
+                break
+            print(f"⚠️ Warm-up navigation failed (attempt {attempt + 1}/{attempts})")
+        else:
+            session.close()
+            raise RuntimeError("Pooled session could not reach the Delta booking widget")
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def _discard(self, session):
+        """Close a broken session and forget about it"""
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        session.close()
+
+    def acquire(self):
+        """Take a warm session out of the pool, replacing it if Chrome died"""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        try:
+            session = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise RuntimeError(f"Driver pool exhausted: no session became free within {self.acquire_timeout}s") from None
+
+        if session is _RELAUNCH:
+            print("🔄 Relaunching a pooled session that failed to start earlier...")
+        elif not session.is_alive():
+            print("⚠️ Pooled browser session is dead, launching a replacement...")
+            self._discard(session)
+        else:
+            return session
+
+        try:
+            return self._new_session()
+        except Exception as e:
+            self._idle.put(_RELAUNCH)
+            raise RuntimeError(f"Driver pool could not launch a session: {e}") from e
+
+    def release(self, session):
+        """Reset a session between searches and return it to the pool"""
+        if self._closed:
+            self._discard(session)
+            return
+
+        # Like the search farm, a session that can refill its form in place keeps its page
+        if not session.is_alive() or (not session.can_refill() and not session.reset_for_next_search()):
+            print("⚠️ Session could not be reset, replacing it...")
+            self._discard(session)
+            try:
+                session = self._new_session()
+            except Exception as e:
+                print(f"❌ Failed to replace pooled session, will retry on next acquire: {e}")
+                session = _RELAUNCH
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self):
+        """Context manager that hands out a session and always takes it back"""
+        session = self.acquire()
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def run_automation(self, **search):
+        """Run one search on a pooled session (same arguments as run_automation)"""
+        with self.session() as session:
+            start = time.time()
+            success = session.run_automation(skip_navigation=True, **search)
+            print(f"⏱️ Pooled search finished in {time.time() - start:.1f}s")
+            return success
+
+    def close(self):
+        """Quit every browser owned by the pool"""
+        self._closed = True
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        print("✅ Driver pool closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Run a few searches back to back on warm sessions"""
+    searches = [
+        {"from_airport": "MCO", "to_airport": "BCN", "date": "09/24/25"},
+        {"from_airport": "MCO", "to_airport": "BCN", "date": "09/25/25"},
+    ]
+
+    with DriverPool(size=1, headless=False, use_proxy=False) as pool:
+        for search in searches:
+            pool.run_automation(**search)
+
+
+if __name__ == "__main__":
+    main()
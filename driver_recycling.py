@@ -0,0 +1,90 @@
+"""
+Browser Recycling Policy
+========================
+Tracks searches served and resident memory of the chromedriver/Chrome process
+tree per driver, and tells the driver lifecycle when to recycle the browser
+so long-running or pooled deployments stay at stable memory.
+
+psutil is used when installed; on Linux /proc is read directly otherwise.
+"""
+
+import os
+import sys
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _proc_children_map():
+    """Map of ppid -> [pid] built from /proc (Linux fallback)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # comm may contain spaces, so split after the closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of a process and all its descendants, or None"""
+    if not pid:
+        return None
+
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    if sys.platform.startswith("linux"):
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        children = _proc_children_map()
+        total, stack = 0, [pid]
+        while stack:
+            current = stack.pop()
+            try:
+                with open(f"/proc/{current}/statm", "r") as f:
+                    total += int(f.read().split()[1]) * page_size
+            except (OSError, IndexError, ValueError):
+                continue
+            stack.extend(children.get(current, []))
+        return total
+
+    return None
+
+
+class RecyclePolicy:
+    def __init__(self, max_searches=50, max_rss_mb=2048):
+        """
+        Initialize the recycling thresholds
+
+        Args:
+            max_searches (int): Recycle after this many searches (None to disable)
+            max_rss_mb (int): Recycle when the process tree exceeds this RSS (None to disable)
+        """
+        self.max_searches = max_searches
+        self.max_rss_mb = max_rss_mb
+
+    def check(self, searches_served, rss_mb):
+        """Return the reason to recycle, or None when the driver can keep going"""
+        if self.max_searches and searches_served >= self.max_searches:
+            return f"served {searches_served} searches (limit {self.max_searches})"
+        if self.max_rss_mb and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return f"RSS {rss_mb:.0f} MB (limit {self.max_rss_mb} MB)"
+        return None
@@ -0,0 +1,140 @@
+"""
+Cached ChromeDriver Resolution
+==============================
+Pins a chromedriver matching the installed Chrome and caches it on disk with a
+manifest, so launches skip the webdriver-manager version lookup and keep
+working offline. The driver is only re-resolved when Chrome's major version changes.
+"""
+
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+from datetime import datetime
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "driver_cache")
+MANIFEST_NAME = "manifest.json"
+
+CHROME_BINARY_CANDIDATES = [
+    "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
+    "C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe",
+    os.path.expandvars("%LOCALAPPDATA%\\Google\\Chrome\\Application\\chrome.exe"),
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+]
+
+
+def find_chrome_binary():
+    """Return the path of the installed Chrome executable, or None"""
+    for candidate in CHROME_BINARY_CANDIDATES:
+        if os.path.isabs(candidate):
+            if os.path.exists(candidate):
+                return candidate
+        else:
+            found = shutil.which(candidate)
+            if found:
+                return found
+    return None
+
+
+def get_chrome_version():
+    """Detect the installed Chrome version string (e.g. '138.0.7204.184'), or None"""
+    # Windows keeps the version in the registry, which avoids spawning Chrome
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+            for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                        return winreg.QueryValueEx(key, "version")[0]
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+
+    chrome = find_chrome_binary()
+    if not chrome:
+        return None
+    try:
+        output = subprocess.run([chrome, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        return None
+    match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+    return match.group(1) if match else None
+
+
+def _load_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_manifest(cache_dir, manifest):
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def resolve_chromedriver(cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Return a chromedriver path matching the installed Chrome
+
+    Uses the cached driver whenever the manifest's Chrome major version still
+    matches; otherwise resolves through webdriver-manager and pins the result.
+    """
+    manifest = _load_manifest(cache_dir)
+    cached_path = manifest.get("driver_path") if manifest else None
+    cached_ok = bool(cached_path) and os.path.exists(cached_path)
+
+    chrome_version = get_chrome_version()
+    chrome_major = chrome_version.split(".")[0] if chrome_version else None
+
+    if cached_ok and (chrome_major is None or manifest.get("chrome_major") == chrome_major):
+        return cached_path
+
+    print(f"🔄 Resolving ChromeDriver for Chrome {chrome_version or 'unknown'}...")
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        source_path = ChromeDriverManager().install()
+    except Exception as e:
+        if cached_ok:
+            print(f"⚠️ ChromeDriver resolution failed ({e}), using cached driver for Chrome {manifest.get('chrome_major')}")
+            return cached_path
+        raise
+
+    # Pin a private copy so webdriver-manager cache cleanups can't break us
+    target_dir = os.path.join(cache_dir, chrome_major or "unknown")
+    os.makedirs(target_dir, exist_ok=True)
+    driver_path = os.path.join(target_dir, os.path.basename(source_path))
+    # Farm workers resolve concurrently and may already be running driver_path:
+    # copying over it fails with ETXTBSY, so copy aside and swap the name atomically
+    tmp_path = f"{driver_path}.{os.getpid()}.tmp"
+    shutil.copy2(source_path, tmp_path)
+    os.chmod(tmp_path, os.stat(tmp_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    try:
+        os.replace(tmp_path, driver_path)
+    except OSError:
+        # Windows refuses to replace a running executable; another worker pinned it already
+        os.remove(tmp_path)
+        if not os.path.exists(driver_path):
+            raise
+
+    _save_manifest(cache_dir, {
+        "chrome_version": chrome_version,
+        "chrome_major": chrome_major,
+        "driver_path": driver_path,
+        "source_path": source_path,
+        "resolved_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    print(f"✅ ChromeDriver pinned: {driver_path}")
+    return driver_path
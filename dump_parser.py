@@ -0,0 +1,376 @@
+"""
+HTML Dump Parser
+================
+Turns saved result pages back into typed flight/fare records, so the dump
+backlog can be reprocessed in bulk. Two sources are supported:
+    - the compressed dump store (dump_store/, see dump_store.py), with search
+      params taken from its index
+    - legacy directories of raw files (html_dumps/flight_results_*.html and
+      the Scrappey result files), with params taken from the file names
+
+lxml is used when installed; the standard library html.parser is the
+fallback. Dumps are streamed and parsed across a process pool.
+
+Usage:
+    python dump_parser.py [dump_store_or_dump_dir] [output.jsonl] [workers]
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+
+from dump_store import DEFAULT_STORE_DIR, DumpStore
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+CARD_CLASS = re.compile(r"flight-card(?!s)|flight-row|mach-flight-card")
+FARE_CLASS = re.compile(r"fare-cell|fare-card|brand-cell")
+SKIP_CLASS = re.compile(r"skeleton", re.I)
+
+TIME_RE = re.compile(r"\b(\d{1,2}:\d{2}\s?[AaPp][Mm])\b")
+AIRPORT_RE = re.compile(r"\b([A-Z]{3})\b")
+FLIGHT_NO_RE = re.compile(r"\b((?:DL|AF|KL|VS|AM|KE|LA|WS)\s?\d{1,4})\b")
+DURATION_RE = re.compile(r"\b(\d{1,2}h(?:\s?\d{1,2}m)?)\b")
+STOPS_RE = re.compile(r"\b(Nonstop|\d+\s+Stops?)\b", re.I)
+PRICE_RE = re.compile(r"([$€£]\s?[\d,]+(?:\.\d{2})?)")
+MILES_RE = re.compile(r"([\d,]+)\s*miles", re.I)
+SOLD_OUT_RE = re.compile(r"sold out|not available", re.I)
+NOT_AIRPORTS = {"USD", "EUR", "GBP"}
+
+# flight_results_initial_MCO_BCN_20250809_005736.html,
+# delta_scrappey_results_MCO_BCN_09-24-25_20250809_005736.html, ...
+DUMP_NAME_RE = re.compile(
+    r"^(?P<kind>flight_results_(?:initial|price_tab)|delta_scrappey_\w+?)_"
+    r"(?P<origin>[A-Z]{3})_(?P<destination>[A-Z]{3})_"
+    r"(?:(?P<date>\d{2}-\d{2}-\d{2})_)?(?P<timestamp>\d{8}_\d{6})"
+)
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+@dataclass
+class FareRecord:
+    label: str
+    price: str = None
+    amount: float = None
+    miles: int = None
+    sold_out: bool = False
+
+
+@dataclass
+class FlightRecord:
+    flight_numbers: list = field(default_factory=list)
+    departure_time: str = None
+    arrival_time: str = None
+    origin: str = None
+    destination: str = None
+    via: list = field(default_factory=list)
+    duration: str = None
+    stops: str = None
+    lowest_price: str = None
+    fares: list = field(default_factory=list)
+
+
+@dataclass
+class DumpResult:
+    path: str
+    kind: str = None
+    origin: str = None
+    destination: str = None
+    date: str = None
+    timestamp: str = None
+    size: int = 0
+    flights: list = field(default_factory=list)
+    cards: int = 0
+    parser: str = None
+    error: str = None
+    elapsed: float = 0.0
+
+
+def _squash(text):
+    return " ".join(text.split())
+
+
+def _unique(items):
+    return list(dict.fromkeys(items))
+
+
+def parse_fare(text, label=None):
+    """Build a FareRecord from a fare cell's text, or None if it has no fare"""
+    price = PRICE_RE.search(text)
+    miles = MILES_RE.search(text)
+    sold_out = bool(SOLD_OUT_RE.search(text))
+    if not price and not miles and not sold_out:
+        return None
+    if not label:
+        label = _squash(MILES_RE.sub("", PRICE_RE.sub("", text)))
+    return FareRecord(
+        label=label[:80],
+        price=price.group(1) if price else None,
+        amount=float(re.sub(r"[^\d.]", "", price.group(1))) if price else None,
+        miles=int(miles.group(1).replace(",", "")) if miles else None,
+        sold_out=sold_out,
+    )
+
+
+def parse_card(text, fares):
+    """Build a FlightRecord from a card's text and its fare cells"""
+    times = TIME_RE.findall(text)
+    airports = _unique(code for code in AIRPORT_RE.findall(text) if code not in NOT_AIRPORTS)
+    duration = DURATION_RE.search(text)
+    stops = STOPS_RE.search(text)
+    cheapest = PRICE_RE.search(text)
+    return FlightRecord(
+        flight_numbers=_unique(FLIGHT_NO_RE.findall(text)),
+        departure_time=times[0] if times else None,
+        arrival_time=times[1] if len(times) > 1 else None,
+        origin=airports[0] if airports else None,
+        destination=airports[-1] if len(airports) > 1 else None,
+        via=airports[1:-1],
+        duration=duration.group(1) if duration else None,
+        stops=stops.group(1) if stops else None,
+        lowest_price=cheapest.group(1) if cheapest else None,
+        fares=fares,
+    )
+
+
+class _CardCollector(HTMLParser):
+    """html.parser fallback: collects text of outermost flight cards and their fare cells"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # (tag, role) where role is "card", "fare" or None
+        self.cards = []  # [card_text_parts, [(fare_label, fare_text_parts)]]
+        self.in_card = 0
+        self.fare_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = attrs.get("class") or ""
+        role = None
+        if not SKIP_CLASS.search(classes):
+            if not self.in_card and (CARD_CLASS.search(classes) or tag == "mach-flight-card"):
+                role = "card"
+                self.cards.append([[], []])
+            elif self.in_card and not self.fare_depth and FARE_CLASS.search(classes):
+                role = "fare"
+                self.cards[-1][1].append((attrs.get("aria-label"), []))
+        if role == "card":
+            self.in_card += 1
+        elif role == "fare":
+            self.fare_depth += 1
+        self.stack.append((tag, role))
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed tags by unwinding to the matching start tag
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, role = self.stack.pop()
+            if role == "card":
+                self.in_card -= 1
+            elif role == "fare":
+                self.fare_depth -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.in_card:
+            self.cards[-1][0].append(data)
+            if self.fare_depth:
+                self.cards[-1][1][-1][1].append(data)
+
+
+def _cards_with_html_parser(html):
+    collector = _CardCollector()
+    collector.feed(html)
+    collector.close()
+    return [
+        (_squash(" ".join(parts)), [(label, _squash(" ".join(fare_parts))) for label, fare_parts in fares])
+        for parts, fares in collector.cards
+    ]
+
+
+def _cards_with_lxml(html):
+    tree = lxml.html.fromstring(html)
+    cards, taken = [], set()
+    for element in tree.iter():
+        if not isinstance(element.tag, str):
+            continue
+        classes = element.get("class") or ""
+        if SKIP_CLASS.search(classes) or not (CARD_CLASS.search(classes) or element.tag == "mach-flight-card"):
+            continue
+        # Keep the outermost card only
+        if any(ancestor in taken for ancestor in element.iterancestors()):
+            continue
+        taken.add(element)
+        fares = [
+            (cell.get("aria-label"), _squash(cell.text_content()))
+            for cell in element.iterdescendants()
+            if isinstance(cell.tag, str) and FARE_CLASS.search(cell.get("class") or "")
+        ]
+        cards.append((_squash(element.text_content()), fares))
+    return cards
+
+
+def parse_html(html):
+    """
+    Parse one results page
+
+    Returns:
+        tuple: (list of FlightRecord, parser name)
+    """
+    if lxml is not None:
+        raw_cards, parser = _cards_with_lxml(html), "lxml"
+    else:
+        raw_cards, parser = _cards_with_html_parser(html), "html.parser"
+
+    flights = []
+    for text, fare_cells in raw_cards:
+        fares = [fare for fare in (parse_fare(fare_text, label) for label, fare_text in fare_cells) if fare]
+        flight = parse_card(text, fares)
+        # Placeholder cards (still loading, empty selections) carry no flight data
+        if flight.departure_time or flight.fares or flight.lowest_price:
+            flights.append(flight)
+    return flights, parser
+
+
+def parse_dump_name(path):
+    """Search metadata encoded in a dump's file name"""
+    match = DUMP_NAME_RE.match(os.path.basename(path))
+    return match.groupdict() if match else {}
+
+
+def parse_file(path):
+    """Parse one dump file into a DumpResult (errors are recorded, not raised)"""
+    start = time.perf_counter()
+    result = DumpResult(path=path, **parse_dump_name(path))
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        result.size = len(html.encode("utf-8"))
+        result.flights, result.parser = parse_html(html)
+        result.cards = len(result.flights)
+    except Exception as e:
+        result.error = str(e)
+    result.elapsed = round(time.perf_counter() - start, 4)
+    return result
+
+
+def parse_store_entry(job):
+    """Parse one HTML dump from the store; job is (store root, index entry)"""
+    root, entry = job
+    start = time.perf_counter()
+    params = entry.get("params") or {}
+    result = DumpResult(
+        path=entry["path"],
+        kind=entry.get("kind"),
+        origin=params.get("from_airport"),
+        destination=params.get("to_airport"),
+        date=params.get("date"),
+        timestamp=entry.get("stored_at"),
+        size=entry.get("size", 0),
+    )
+    try:
+        html = DumpStore(root).get_text(entry["hash"])
+        result.flights, result.parser = parse_html(html)
+        result.cards = len(result.flights)
+    except Exception as e:
+        result.error = str(e)
+    result.elapsed = round(time.perf_counter() - start, 4)
+    return result
+
+
+def is_store(directory):
+    return os.path.isfile(os.path.join(directory, "index.jsonl"))
+
+
+def iter_store_entries(root, kinds=None):
+    """Stream (root, entry) jobs for the HTML dumps recorded in a store's index"""
+    for entry in DumpStore(root).entries():
+        if ".html." not in os.path.basename(entry.get("path", "")):
+            continue
+        if kinds and entry.get("kind") not in kinds:
+            continue
+        yield root, entry
+
+
+def iter_dump_files(directory, suffixes=(".html", ".htm")):
+    """Stream dump file paths from a directory tree without listing it all up front"""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(suffixes):
+                    yield entry.path
+
+
+def parse_directory(directory, workers=None, chunksize=8):
+    """
+    Parse every dump in a dump store or a directory of raw files across a process pool
+
+    Yields:
+        DumpResult: One per dump, in completion order
+    """
+    if is_store(directory):
+        func, jobs = parse_store_entry, iter_store_entries(directory)
+    else:
+        func, jobs = parse_file, iter_dump_files(directory)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for job in jobs:
+            yield func(job)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(func, jobs, chunksize=chunksize):
+            yield result
+
+
+def write_jsonl(results, output_path):
+    """Write DumpResults as JSON lines; returns (files, flights, errors)"""
+    files = flights = errors = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(asdict(result)) + "\n")
+            files += 1
+            flights += len(result.flights)
+            errors += 1 if result.error else 0
+    return files, flights, errors
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    directory = argv[0] if argv else DEFAULT_STORE_DIR
+    output_path = argv[1] if len(argv) > 1 else "parsed_dumps.jsonl"
+    workers = int(argv[2]) if len(argv) > 2 else None
+
+    start = time.perf_counter()
+    files, flights, errors = write_jsonl(parse_directory(directory, workers), output_path)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Parsed {files} dump(s) into {flights} flight record(s) in {elapsed:.2f}s "
+          f"({files / elapsed if elapsed else 0:.1f} files/s, parser: {'lxml' if lxml else 'html.parser'})")
+    if errors:
+        print(f"⚠️ {errors} dump(s) failed to parse, see the 'error' field in {output_path}")
+    print(f"💾 Records saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Compressed Content-Addressed Dump Store
+=======================================
+Replaces raw timestamped HTML/JSON files with compressed blobs keyed by the
+SHA-256 of their content, so identical pages are stored once. Every put() is
+recorded in index.jsonl with its search params, which the reader API uses to
+look dumps up again.
+
+Layout (shared with delta_flight_fetcher.js; stored_at is always UTC):
+    dump_store/
+        index.jsonl                      one JSON entry per put()
+        blobs/ab/abcdef....html.zst      zstd when the zstandard package is installed
+        blobs/ab/abcdef....json.gz       gzip otherwise
+
+params["date"] is normalized to ISO (YYYY-MM-DD) on put() and find(), since
+the writers use MM/DD/YY, MM/DD/YYYY and ISO dates for the same search.
+
+Usage:
+    python dump_store.py [list|stats] [key=value ...]
+    python dump_store.py cat <hash>
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dump_store")
+CODEC_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%y", "%m/%d/%Y", "%m-%d-%y", "%m-%d-%Y")
+
+
+def normalize_date(value):
+    """ISO form of a search date in any of the writers' formats (unknown formats pass through)"""
+    if not isinstance(value, str):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return value
+
+
+def normalize_params(params):
+    params = dict(params or {})
+    if "date" in params:
+        params["date"] = normalize_date(params["date"])
+    return params
+
+
+class DumpStore:
+    def __init__(self, root=DEFAULT_STORE_DIR, codec=None, level=None):
+        """
+        Initialize the store
+
+        Args:
+            root (str): Store directory
+            codec (str): "zstd" or "gzip" (zstd when available by default)
+            level (int): Compression level (codec default if None)
+        """
+        self.root = root
+        self.codec = codec or ("zstd" if zstandard else "gzip")
+        if self.codec == "zstd" and not zstandard:
+            raise ImportError("zstandard is not installed; use codec='gzip'")
+        self.level = level
+        self.index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+
+    def _blob_path(self, digest, ext, codec):
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.{ext}{CODEC_SUFFIXES[codec]}")
+
+    def _find_blob(self, digest):
+        """Existing blob for a hash in any extension or codec, or None"""
+        directory = os.path.join(self.root, "blobs", digest[:2])
+        try:
+            for name in os.listdir(directory):
+                if name.startswith(digest + ".") and not name.endswith(".tmp"):
+                    return os.path.join(directory, name)
+        except FileNotFoundError:
+            pass
+        return None
+
+    @staticmethod
+    def digest(content):
+        """SHA-256 hex digest a put() of this content is stored under"""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        return hashlib.sha256(data).hexdigest()
+
+    def locate(self, digest, ext="html"):
+        """Path of the blob for a hash: the existing one, or where put() will write it"""
+        return self._find_blob(digest) or self._blob_path(digest, ext, self.codec)
+
+    def _compress(self, data):
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(data)
+        return gzip.compress(data, compresslevel=self.level or 6, mtime=0)
+
+    @staticmethod
+    def _decompress(path, data):
+        if path.endswith(".zst"):
+            if not zstandard:
+                raise ImportError(f"zstandard is required to read {path}")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if path.endswith(".gz"):
+            return gzip.decompress(data)
+        return data
+
+    def put(self, content, kind, params=None, ext="html", name=None, digest=None):
+        """
+        Store content once and record it in the index
+
+        Args:
+            content (str or bytes): Page HTML, JSON text, ...
+            kind (str): What the dump is (e.g. "flight_results_initial", "scrappey_summary")
+            params (dict): Search params used by find()
+            ext (str): Content extension ("html", "json")
+            name (str): Original file name, kept in the index for reference
+            digest (str): Precomputed digest(content), if the caller already has it
+
+        Returns:
+            dict: The index entry (hash, path, sizes, deduplicated flag, ...)
+        """
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = digest or hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            path = self._find_blob(digest)
+            deduplicated = path is not None
+            if not deduplicated:
+                path = self._blob_path(digest, ext, self.codec)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(self._compress(data))
+                os.replace(tmp_path, path)
+
+            entry = {
+                "hash": digest,
+                "kind": kind,
+                "params": normalize_params(params),
+                "name": name,
+                "path": os.path.relpath(path, self.root),
+                "size": len(data),
+                "stored_size": os.path.getsize(path),
+                "deduplicated": deduplicated,
+                "stored_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def put_json(self, obj, kind, params=None, name=None):
+        """Store a JSON-serializable object (canonical form, so equal objects dedupe)"""
+        return self.put(json.dumps(obj, sort_keys=True, separators=(",", ":")), kind, params, ext="json", name=name)
+
+    def entries(self):
+        """Iterate index entries, oldest first"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+        except FileNotFoundError:
+            return
+
+    def find(self, kind=None, **params):
+        """Index entries matching a kind and search params (e.g. from_airport="MCO", date="09/24/25")"""
+        params = normalize_params(params)
+        return [
+            entry for entry in self.entries()
+            if (kind is None or entry.get("kind") == kind)
+            and all(entry.get("params", {}).get(key) == value for key, value in params.items())
+        ]
+
+    def latest(self, kind=None, **params):
+        """Most recent matching entry, or None"""
+        matches = self.find(kind, **params)
+        return matches[-1] if matches else None
+
+    def get(self, digest):
+        """Raw bytes of a blob"""
+        path = self._find_blob(digest)
+        if not path:
+            raise KeyError(f"No blob for hash {digest}")
+        with open(path, "rb") as f:
+            return self._decompress(path, f.read())
+
+    def get_text(self, digest):
+        return self.get(digest).decode("utf-8")
+
+    def get_json(self, digest):
+        return json.loads(self.get(digest))
+
+    def stats(self):
+        """Entry, blob and size totals for the store"""
+        entries = list(self.entries())
+        blobs = {entry["hash"]: entry for entry in entries}
+        return {
+            "entries": len(entries),
+            "blobs": len(blobs),
+            "logical_bytes": sum(entry["size"] for entry in entries),
+            "stored_bytes": sum(entry["stored_size"] for entry in blobs.values()),
+        }
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else "stats"
+    store = DumpStore()
+
+    if command == "cat" and len(args) > 1:
+        sys.stdout.write(store.get_text(args[1]))
+    elif command == "list":
+        params = dict(arg.split("=", 1) for arg in args[1:] if "=" in arg)
+        kind = params.pop("kind", None)
+        for entry in store.find(kind, **params):
+            print(f"{entry['stored_at']}  {entry['hash'][:12]}  {entry['kind']:<28} {entry['params']}")
+    else:
+        stats = store.stats()
+        ratio = stats["logical_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0
+        print(f"📦 {stats['entries']} entries, {stats['blobs']} unique blobs")
+        print(f"💾 {stats['logical_bytes'] / 1024:.1f} KB logical, {stats['stored_bytes'] / 1024:.1f} KB on disk ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+In-Page Flight Card Extraction
+==============================
+Walks the rendered search results (flight-results-grid, flight-card,
+mach-flight-results-grid) with one script in the page and returns a compact
+JSON list of flights and fares, instead of pulling the full page_source over
+the WebDriver wire and parsing it afterwards.
+
+Field values are parsed from the card text, so they survive Delta's frequent
+class-name changes; the raw card text is kept (trimmed) for anything missed.
+"""
+
+import time
+
+FLIGHT_CARDS_SCRIPT = """
+var containerCss = arguments[0], cardCss = arguments[1], fareCss = arguments[2], maxText = arguments[3];
+
+function text(el) { return (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim(); }
+function all(re, s) { var out = [], m; re.lastIndex = 0; while ((m = re.exec(s))) { out.push(m[1] || m[0]); } return out; }
+function unique(list) { return list.filter(function (v, i) { return list.indexOf(v) === i; }); }
+
+var TIME = /\\b(\\d{1,2}:\\d{2}\\s?[AaPp][Mm])\\b/g;
+var AIRPORT = /\\b([A-Z]{3})\\b/g;
+var FLIGHT_NO = /\\b((?:DL|AF|KL|VS|AM|KE|LA|WS)\\s?\\d{1,4})\\b/g;
+var DURATION = /\\b(\\d{1,2}h(?:\\s?\\d{1,2}m)?)\\b/;
+var STOPS = /\\b(Nonstop|\\d+\\s+Stops?)\\b/i;
+var PRICE = /([$€£]\\s?[\\d,]+(?:\\.\\d{2})?)/;
+var MILES = /([\\d,]+)\\s*miles/i;
+
+var roots = document.querySelectorAll(containerCss);
+var scope = roots.length ? roots : [document];
+var cards = [];
+for (var r = 0; r < scope.length; r++) {
+    var found = scope[r].querySelectorAll(cardCss);
+    for (var c = 0; c < found.length; c++) {
+        var card = found[c];
+        // Skip loading skeletons and list wrappers such as shopping-selected-flight-cards
+        if (cards.indexOf(card) !== -1 || /skeleton|flight-cards/i.test(card.className)) { continue; }
+        // Keep the outermost card only
+        if (cards.some(function (other) { return other.contains(card); })) { continue; }
+        cards.push(card);
+    }
+}
+
+var flights = cards.map(function (card, index) {
+    var body = text(card);
+    var times = all(TIME, body);
+    var airports = unique(all(AIRPORT, body).filter(function (code) {
+        return ['USD', 'EUR', 'GBP'].indexOf(code) === -1;
+    }));
+    var fares = [];
+    var cells = card.querySelectorAll(fareCss);
+    for (var f = 0; f < cells.length; f++) {
+        var cellText = text(cells[f]);
+        var price = PRICE.exec(cellText), miles = MILES.exec(cellText);
+        if (!price && !miles && !/sold out|not available/i.test(cellText)) { continue; }
+        fares.push({
+            label: (cells[f].getAttribute('aria-label') || cellText.replace(PRICE, '').replace(MILES, '')).trim().slice(0, 80),
+            price: price ? price[1] : null,
+            amount: price ? parseFloat(price[1].replace(/[^\\d.]/g, '')) : null,
+            miles: miles ? parseInt(miles[1].replace(/,/g, ''), 10) : null,
+            sold_out: /sold out|not available/i.test(cellText)
+        });
+    }
+    var duration = DURATION.exec(body), stops = STOPS.exec(body), cheapest = PRICE.exec(body);
+    return {
+        index: index,
+        flight_numbers: unique(all(FLIGHT_NO, body)),
+        departure_time: times[0] || null,
+        arrival_time: times[1] || null,
+        origin: airports[0] || null,
+        destination: airports.length > 1 ? airports[airports.length - 1] : null,
+        via: airports.slice(1, -1),
+        duration: duration ? duration[1] : null,
+        stops: stops ? stops[1] : null,
+        lowest_price: cheapest ? cheapest[1] : null,
+        fares: fares,
+        text: body.slice(0, maxText)
+    };
+});
+return {flights: flights, cards: cards.length, url: location.href};
+"""
+
+DEFAULT_CONTAINER_SELECTORS = [
+    "div.flight-results-grid",
+    "div[class*='mach-flight-results-grid']",
+    "div[id*='flight-results']",
+]
+
+DEFAULT_CARD_SELECTORS = [
+    "[class*='flight-card']",
+    "mach-flight-card",
+    "[class*='flight-row']",
+]
+
+DEFAULT_FARE_SELECTORS = [
+    "[class*='fare-cell']",
+    "[class*='fare-card']",
+    "[class*='brand-cell']",
+    "button[aria-label*='$']",
+]
+
+
+def extract_flights(driver, container_selectors=None, card_selectors=None, fare_selectors=None, max_text=300):
+    """
+    Extract the rendered flight cards in one script call
+
+    Returns:
+        dict: flights (list of dicts), cards (count), url, elapsed (seconds)
+    """
+    start = time.time()
+    try:
+        result = driver.execute_script(
+            FLIGHT_CARDS_SCRIPT,
+            ", ".join(container_selectors or DEFAULT_CONTAINER_SELECTORS),
+            ", ".join(card_selectors or DEFAULT_CARD_SELECTORS),
+            ", ".join(fare_selectors or DEFAULT_FARE_SELECTORS),
+            max_text,
+        ) or {}
+    except Exception as e:
+        print(f"⚠️ Flight card extraction failed: {e}")
+        result = {}
+    return {
+        "flights": result.get("flights", []),
+        "cards": result.get("cards", 0),
+        "url": result.get("url"),
+        "elapsed": round(time.time() - start, 3),
+    }
@@ -0,0 +1,238 @@
+"""
+Batched In-Page Form Filling
+============================
+Runs a whole form phase (open the airport modal, type the code, wait for the
+suggestion, pick it) as one execute_async_script program instead of dozens of
+find/wait/click/send_keys round trips to chromedriver.
+
+A phase is a list of actions built with click(), type_text() and wait_for();
+run_phase() returns a structured result the bot can log, or use to fall back
+to its step-by-step WebDriver path. jump_to_date() does the same for the date
+picker: it reads the shown month once and advances straight to the target.
+"""
+
+import time
+
+from wait_engine import selector_spec
+
+PHASE_SCRIPT = """
+var actions = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), steps = [];
+
+function find(specs, textContains) {
+    for (var i = 0; i < specs.length; i++) {
+        var element = null;
+        try {
+            if (specs[i][0] === 'xpath') {
+                element = document.evaluate(specs[i][1], document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            } else {
+                element = document.querySelector(specs[i][1]);
+            }
+        } catch (e) {
+            element = null;
+        }
+        if (element && element.nodeType === 1 &&
+                (!textContains || (element.textContent || '').toUpperCase().indexOf(textContains.toUpperCase()) !== -1)) {
+            return [i, element];
+        }
+    }
+    return null;
+}
+
+function waitFor(action, callback) {
+    var began = Date.now();
+    (function poll() {
+        var match = find(action.selectors, action.text_contains);
+        if (match) { return callback(match); }
+        if (Date.now() - began >= action.timeout_ms || Date.now() - start >= timeoutMs) { return callback(null); }
+        setTimeout(poll, 50);
+    })();
+}
+
+function typeInto(element, text) {
+    // Per-character input events so Angular's lookup sees real typing
+    var setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;
+    element.focus();
+    setter.call(element, '');
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    for (var i = 0; i < text.length; i++) {
+        var key = text[i];
+        element.dispatchEvent(new KeyboardEvent('keydown', {key: key, bubbles: true}));
+        setter.call(element, element.value + key);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new KeyboardEvent('keyup', {key: key, bubbles: true}));
+    }
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+function fail(action, error) {
+    done({ok: false, failed: action.name, error: error || null, steps: steps, elapsed_ms: Date.now() - start});
+}
+
+(function run(k) {
+    if (k >= actions.length) {
+        return done({ok: true, failed: null, error: null, steps: steps, elapsed_ms: Date.now() - start});
+    }
+    var action = actions[k];
+    waitFor(action, function (match) {
+        if (!match) { return fail(action, 'not found'); }
+        try {
+            if (action.op === 'click') {
+                match[1].scrollIntoView({block: 'center'});
+                match[1].click();
+            } else if (action.op === 'type') {
+                typeInto(match[1], action.text);
+            }
+        } catch (e) {
+            return fail(action, String(e));
+        }
+        steps.push({name: action.name, selector: match[0], at_ms: Date.now() - start});
+        run(k + 1);
+    });
+})(0);
+"""
+
+# Reads the displayed month once, clicks "next" exactly as often as needed in
+# one burst, then clicks the target data-date cell
+CALENDAR_JUMP_SCRIPT = """
+var target = arguments[0], targetMonth = arguments[1], targetYear = arguments[2];
+var headerCss = arguments[3], nextCss = arguments[4], timeoutMs = arguments[5];
+var done = arguments[arguments.length - 1];
+var MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'];
+var start = Date.now();
+var cellCss = [
+    "td.dl-datepicker-available-day a[data-date='" + target + "']",
+    "a[data-date='" + target + "']",
+    "td[data-date='" + target + "']",
+    "button[data-date='" + target + "']"
+].join(', ');
+
+function finish(result) { result.elapsed_ms = Date.now() - start; done(result); }
+
+function clickCell(advances, shown) {
+    (function poll() {
+        var cell = document.querySelector(cellCss);
+        if (cell) {
+            cell.click();
+            return finish({ok: true, advances: advances, shown: shown});
+        }
+        if (Date.now() - start >= timeoutMs) {
+            return finish({ok: false, error: 'date cell not found', advances: advances, shown: shown});
+        }
+        setTimeout(poll, 50);
+    })();
+}
+
+if (document.querySelector(cellCss)) { return clickCell(0, null); }
+
+var header = document.querySelector(headerCss);
+if (!header) { return finish({ok: false, error: 'calendar header not found'}); }
+var match = /([A-Za-z]+)\s+(\d{4})/.exec(header.textContent || '');
+var month = match ? MONTHS.indexOf(match[1].slice(0, 3).toLowerCase()) + 1 : 0;
+if (!month) { return finish({ok: false, error: 'unreadable calendar header: ' + header.textContent}); }
+
+var advances = (targetYear - parseInt(match[2], 10)) * 12 + (targetMonth - month);
+if (advances < 0 || advances > 12) {
+    return finish({ok: false, error: 'target month out of range', advances: advances, shown: match[0]});
+}
+for (var i = 0; i < advances; i++) {
+    var next = document.querySelector(nextCss);
+    if (!next) { return finish({ok: false, error: 'next month button not found', advances: i, shown: match[0]}); }
+    next.click();
+}
+clickCell(advances, match[0]);
+"""
+
+
+def _action(op, name, selectors, timeout, **extra):
+    action = {
+        "op": op,
+        "name": name,
+        "selectors": [selector_spec(by, selector) for by, selector in selectors],
+        "timeout_ms": int(timeout * 1000),
+    }
+    action.update(extra)
+    return action
+
+
+def click(name, selectors, timeout=5, text_contains=None):
+    """Wait for the first matching selector and click it"""
+    return _action("click", name, selectors, timeout, text_contains=text_contains)
+
+
+def type_text(name, selectors, text, timeout=5):
+    """Wait for the first matching input and type text into it"""
+    return _action("type", name, selectors, timeout, text=text)
+
+
+def wait_for(name, selectors, timeout=5, text_contains=None):
+    """Wait until a selector matches without acting on it"""
+    return _action("wait", name, selectors, timeout, text_contains=text_contains)
+
+
+def airport_phase(field_selectors, input_selectors, suggestion_selectors, airport_code):
+    """Open the airport lookup modal, type the code and pick the matching suggestion"""
+    return [
+        click("airport field", field_selectors),
+        type_text("airport input", input_selectors, airport_code),
+        click("airport suggestion", suggestion_selectors, timeout=8, text_contains=airport_code),
+    ]
+
+
+def trip_type_phase(dropdown_selectors, option_selectors):
+    """Open the trip type dropdown and pick an option"""
+    return [
+        click("trip type dropdown", dropdown_selectors),
+        click("trip type option", option_selectors),
+    ]
+
+
+def calendar_phase(date_field_selectors, header_selectors):
+    """Open the departure calendar and wait until it has rendered"""
+    return [
+        click("departure date field", date_field_selectors),
+        wait_for("calendar header", header_selectors, timeout=3),
+    ]
+
+
+def jump_to_date(driver, date_obj, header_css, next_css, timeout=5):
+    """
+    Select a date in an open calendar with one scripted month jump
+
+    Args:
+        date_obj (datetime): Target date
+        header_css (str): CSS selector(s) for the displayed month title
+        next_css (str): CSS selector(s) for the next month button
+
+    Returns:
+        dict: ok, advances, shown (header month read), error, elapsed_ms
+    """
+    try:
+        driver.set_script_timeout(max(timeout + 5, 30))
+        result = driver.execute_async_script(
+            CALENDAR_JUMP_SCRIPT, date_obj.strftime("%m/%d/%Y"), date_obj.month, date_obj.year,
+            header_css, next_css, int(timeout * 1000)
+        )
+    except Exception as e:
+        result = {"ok": False, "error": str(e)}
+    return result or {"ok": False, "error": "no result"}
+
+
+def run_phase(driver, actions, timeout=20):
+    """
+    Execute a phase in one execute_async_script call
+
+    Returns:
+        dict: ok, failed (action name), error, steps [{name, selector, at_ms}],
+        elapsed_ms, round_trip (seconds including the WebDriver call)
+    """
+    start = time.time()
+    try:
+        driver.set_script_timeout(max(timeout + 5, 30))
+        result = driver.execute_async_script(PHASE_SCRIPT, actions, int(timeout * 1000))
+    except Exception as e:
+        result = {"ok": False, "failed": "script", "error": str(e), "steps": [], "elapsed_ms": None}
+    result = result or {"ok": False, "failed": "script", "error": "no result", "steps": [], "elapsed_ms": None}
+    result["round_trip"] = round(time.time() - start, 3)
+    return result
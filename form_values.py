@@ -0,0 +1,79 @@
+"""
+Booking Widget Field Values
+===========================
+Parses what the booking widget displays (airport fields such as
+"SCL SANTIAGO", the departure field such as "Wed, Sep 24" or
+"Sep 24, 2025") into values that can be compared exactly with the
+requested search, so unchanged fields can be skipped safely.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+
+MONTHS = {name: index for index, name in enumerate(
+    ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"], start=1)}
+
+AIRPORT_TOKEN_RE = re.compile(r"^[A-Z]{3}$")
+# "Sep 24", "SEPT 24, 2025", "September 24 2025"
+MONTH_DAY_RE = re.compile(r"\b([A-Z]{3})[A-Z]*\.?\s+(\d{1,2})(?!\d)(?:,?\s+(\d{4}))?\b")
+# "24 Sep 2025"
+DAY_MONTH_RE = re.compile(r"\b(\d{1,2})\s+([A-Z]{3})[A-Z]*\.?(?:,?\s+(\d{4}))?\b")
+# "09/24/2025", "09/24/25"
+NUMERIC_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{2}|\d{4})\b")
+
+
+def airport_code(text):
+    """The leading three-letter airport code of a field's text, or None"""
+    tokens = (text or "").upper().split()
+    if tokens and AIRPORT_TOKEN_RE.match(tokens[0].strip(",()")):
+        return tokens[0].strip(",()")
+    return None
+
+
+def _infer_year(month, day, today):
+    """Nearest year (this one or the next) in which month/day is not in the past"""
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if candidate >= today - timedelta(days=1):
+            return candidate
+    return None
+
+
+def parse_widget_date(text, today=None):
+    """
+    Parse the departure field's text into a date
+
+    Args:
+        text (str): Displayed text, e.g. "Wed, Sep 24" or "Sep 24, 2025"
+        today (date): Reference for displays without a year (defaults to today)
+
+    Returns:
+        date or None: The displayed date, None when it cannot be read
+    """
+    text = (text or "").upper()
+    today = today or date.today()
+
+    match = NUMERIC_RE.search(text)
+    if match:
+        month, day, year = int(match.group(1)), int(match.group(2)), match.group(3)
+        try:
+            return datetime.strptime(f"{month}/{day}/{year}", "%m/%d/%Y" if len(year) == 4 else "%m/%d/%y").date()
+        except ValueError:
+            return None
+
+    for pattern, month_group, day_group in ((MONTH_DAY_RE, 1, 2), (DAY_MONTH_RE, 2, 1)):
+        for match in pattern.finditer(text):
+            month = MONTHS.get(match.group(month_group))
+            if not month:
+                continue
+            day, year = int(match.group(day_group)), match.group(3)
+            if year:
+                try:
+                    return date(int(year), month, day)
+                except ValueError:
+                    return None
+            return _infer_year(month, day, today)
+    return None
@@ -0,0 +1,77 @@
+"""
+GraphQL Offer Capture
+=====================
+Listens to the CDP Network events drained by WaitEngine and, whenever the
+page's own call to offer-api-prd.delta.com/prd/rm-offer-gql finishes, pulls
+the response body with Network.getResponseBody. The parsed gqlSearchOffers
+payload is the same data delta_flight_fetcher.js requests through Scrappey,
+obtained here without HTML scraping or a second request.
+"""
+
+import base64
+import json
+import time
+
+OFFER_API_PATTERN = "rm-offer-gql"
+
+
+class OfferCapture:
+    def __init__(self, driver, url_contains=OFFER_API_PATTERN):
+        """
+        Initialize the capture for a driver
+
+        Args:
+            driver: Selenium Chrome driver whose WaitEngine feeds on_event
+            url_contains (str): URL substring of the GraphQL endpoint
+        """
+        self.driver = driver
+        self.url_contains = url_contains
+        self.pending = {}  # requestId -> url of matching responses not yet finished
+        self.responses = []  # Captured {"url", "captured_at", "data"} dicts
+
+    def reset(self):
+        """Forget responses from earlier searches"""
+        self.pending.clear()
+        self.responses = []
+
+    def on_event(self, method, params):
+        """WaitEngine listener: track matching responses and fetch their bodies"""
+        if method == "Network.responseReceived":
+            url = params.get("response", {}).get("url", "")
+            if self.url_contains in url:
+                self.pending[params.get("requestId")] = url
+        elif method == "Network.loadingFinished":
+            url = self.pending.pop(params.get("requestId"), None)
+            if url:
+                self._fetch_body(params["requestId"], url)
+        elif method == "Network.loadingFailed":
+            self.pending.pop(params.get("requestId"), None)
+
+    def _fetch_body(self, request_id, url):
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            body = result.get("body", "")
+            if result.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8")
+            data = json.loads(body)
+        except Exception as e:
+            print(f"⚠️ Could not read GraphQL offer response: {e}")
+            return
+        self.responses.append({"url": url, "captured_at": time.time(), "data": data})
+        offers = self._offers_of(data)
+        if offers is not None:
+            print(f"📡 Captured gqlSearchOffers response ({len(offers.get('gqlOffersSets') or [])} offer set(s))")
+
+    @staticmethod
+    def _offers_of(data):
+        if isinstance(data, dict):
+            return (data.get("data") or {}).get("gqlSearchOffers")
+        return None
+
+    def latest_offers(self):
+        """The most recent gqlSearchOffers payload, or None"""
+        for response in reversed(self.responses):
+            offers = self._offers_of(response["data"])
+            if offers is not None:
+                return offers
+        return None
@@ -17,11 +17,12 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolve_chromedriver
+from profile_manager import ProfileManager
 
 
 class DeltaFlightAutomationAdvanced:
-    def __init__(self, headless=True, timeout=30, use_proxy=True, use_profile=True):
+    def __init__(self, headless=True, timeout=30, use_proxy=True, use_profile=True, worker_id=None):
         """
         Initialize the Delta Flight Automation with WebDriver Manager
         
@@ -30,6 +31,7 @@ class DeltaFlightAutomationAdvanced:
             timeout (int): Default timeout for WebDriverWait
             use_proxy (bool): Use proxy server for requests
             use_profile (bool): Use persistent Chrome profile
+            worker_id: Profile slot derived from the seed profile (first free slot if None)
         """
         self.timeout = timeout
         self.driver = None
@@ -37,29 +39,34 @@ class DeltaFlightAutomationAdvanced:
         self.use_proxy = False
         self.use_profile = use_profile
         self.profile_name = "FlightAutomationProfile"
+        self.profile_manager = None
+        self.worker_id = None
         
         if self.use_profile:
-            self.profile_path = os.path.join(os.getcwd(), "chrome_profile")
+            # Prefer the minimal seed built by build_seed_profile.py when available
+            minimal_seed = os.path.join(os.getcwd(), "seed_profile")
+            if os.path.exists(minimal_seed):
+                self.seed_profile_path = minimal_seed
+            else:
+                self.seed_profile_path = os.path.join(os.getcwd(), "chrome_profile")
             self.create_chrome_profile()
+            self.acquire_worker_profile(worker_id)
         else:
             self.profile_path = None
             
         self.setup_driver(headless)
         
     def create_chrome_profile(self):
-        """Create a Chrome profile if it doesn't exist."""
+        """Create the seed Chrome profile if it doesn't exist."""
         try:
-            if not os.path.exists(self.profile_path):
-                os.makedirs(self.profile_path)
-                print(f"Created Chrome profile directory at: {self.profile_path}")
-            
-            # Kill any existing Chrome processes that might be using the profile
-            self.cleanup_chrome_processes()
+            if not os.path.exists(self.seed_profile_path):
+                os.makedirs(self.seed_profile_path)
+                print(f"Created Chrome profile directory at: {self.seed_profile_path}")
             
             # Launch Chrome with the profile to initialize it if it's new
             profile_check_command = [
                 "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
-                f"--user-data-dir={self.profile_path}",
+                f"--user-data-dir={self.seed_profile_path}",
                 "--no-first-run",
                 "--no-default-browser-check",
                 "--headless",
@@ -67,7 +74,7 @@ class DeltaFlightAutomationAdvanced:
             ]
             
             # Check if profile needs initialization
-            profile_initialized = os.path.exists(os.path.join(self.profile_path, "Default"))
+            profile_initialized = os.path.exists(os.path.join(self.seed_profile_path, "Default"))
             
             if not profile_initialized:
                 print("Initializing new Chrome profile...")
@@ -81,6 +88,18 @@ class DeltaFlightAutomationAdvanced:
         except Exception as e:
             print(f"Error creating Chrome profile: {e}")
             # Continue without custom profile if creation fails
+    
+    def acquire_worker_profile(self, worker_id=None):
+        """Lock an isolated copy of the seed profile for this browser."""
+        try:
+            self.profile_manager = ProfileManager(seed_dir=self.seed_profile_path)
+            self.profile_path = self.profile_manager.acquire(worker_id)
+            self.worker_id = next(iter(self.profile_manager.held))
+        except Exception as e:
+            print(f"⚠️ Could not derive worker profile: {e}")
+            print("🔄 Continuing without profile...")
+            self.profile_manager = None
+            self.profile_path = None
             
     def cleanup_chrome_processes(self):
         """Clean up any Chrome processes that might interfere with profile usage."""
@@ -140,8 +159,8 @@ class DeltaFlightAutomationAdvanced:
             if headless:
                 chrome_options.add_argument("--headless")
             
-            # Use WebDriver Manager to automatically download and manage ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            # Use the pinned ChromeDriver (re-resolved only when Chrome's major version changes)
+            service = Service(resolve_chromedriver())
             
             # Initialize driver
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -1026,6 +1045,10 @@ class DeltaFlightAutomationAdvanced:
                 print("✅ Browser closed successfully")
         except Exception as e:
             print(f"⚠️ Error closing browser: {e}")
+        finally:
+            # Free the worker profile slot for the next browser
+            if self.profile_manager:
+                self.profile_manager.release_all()
 
 
 def main():
@@ -0,0 +1,296 @@
+"""
+Copy-on-Write Chrome Profile Manager
+====================================
+Derives isolated per-worker Chrome profiles from a read-only seed profile
+(the minimal seed_profile from build_seed_profile.py when present, otherwise
+the checked-in chrome_profile) so many browsers can run at once with the
+seed's cookies and state, without sharing a user-data-dir or killing each other.
+
+Immutable component data is hardlinked, everything Chrome may write in place
+is reflinked when the filesystem supports it and copied otherwise.
+"""
+
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+
+FULL_SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chrome_profile")
+MINIMAL_SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_profile")
+DEFAULT_WORKERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker_profiles")
+
+# Downloaded component data: Chrome replaces these directories on update
+# instead of editing files, so sharing inodes with the seed is safe
+HARDLINK_DIRS = {
+    "AmountExtractionHeuristicRegexes",
+    "AutofillStates",
+    "CertificateRevocation",
+    "Crowd Deny",
+    "FirstPartySetsPreloaded",
+    "MaskedDomainListPreloaded",
+    "MEIPreload",
+    "MediaFoundationWidevineCdm",
+    "OnDeviceHeadSuggestModel",
+    "OptimizationHints",
+    "PKIMetadata",
+    "PrivacySandboxAttestationsPreloaded",
+    "ProbabilisticRevealTokenRegistry",
+    "SafetyTips",
+    "Subresource Filter",
+    "TpcdMetadata",
+    "TrustTokenKeyCommitments",
+    "ZxcvbnData",
+    "component_crx_cache",
+    "hyphen-data",
+    "optimization_guide_model_store",
+}
+
+# Caches and runtime files that must never be shared between browsers
+SKIP_NAMES = {
+    "SingletonLock",
+    "SingletonCookie",
+    "SingletonSocket",
+    "lockfile",
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "DawnGraphiteCache",
+    "DawnWebGPUCache",
+    "Crashpad",
+    "CrashpadMetrics-active.pma",
+    "chrome_debug.log",
+}
+
+FICLONE = 0x40049409  # Linux ioctl for reflink copies (btrfs, xfs)
+
+
+def pid_alive(pid):
+    """Check whether a process id is still running"""
+    if pid <= 0:
+        return False
+    if sys.platform.startswith("win"):
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def file_lock(path):
+    """OS-level exclusive lock on a file (blocks until it is free)"""
+    with open(path, "a+") as f:
+        if sys.platform.startswith("win"):
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def default_seed_dir():
+    """The minimal seed from build_seed_profile.py when it exists, else the full chrome_profile"""
+    return MINIMAL_SEED_DIR if os.path.isdir(MINIMAL_SEED_DIR) else FULL_SEED_DIR
+
+
+def _reflink_or_copy(src, dst):
+    """Clone a file with a reflink when possible, otherwise copy it"""
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _hardlink_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        _reflink_or_copy(src, dst)
+
+
+class ProfileManager:
+    def __init__(self, seed_dir=None, workers_dir=DEFAULT_WORKERS_DIR):
+        """
+        Initialize the profile manager
+
+        Args:
+            seed_dir (str): Read-only seed profile to derive workers from
+                (default_seed_dir() if None)
+            workers_dir (str): Directory holding the per-worker profiles and lock files
+        """
+        self.seed_dir = seed_dir or default_seed_dir()
+        self.workers_dir = workers_dir
+        self.held = {}  # worker_id -> profile path
+        os.makedirs(self.workers_dir, exist_ok=True)
+
+    def _lock_path(self, worker_id):
+        return os.path.join(self.workers_dir, f"worker_{worker_id}.lock")
+
+    def _profile_path(self, worker_id):
+        return os.path.join(self.workers_dir, f"worker_{worker_id}")
+
+    def _guard(self):
+        """OS-level exclusive lock serializing stale-lock recovery across processes"""
+        return file_lock(os.path.join(self.workers_dir, ".locks.guard"))
+
+    def _create_lock(self, lock_path, owner_pid):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(str(owner_pid or os.getpid()))
+        return True
+
+    def _try_lock(self, worker_id, owner_pid=None, fresh_grace=5):
+        """Create the worker lock file atomically, clearing it if its owner died"""
+        lock_path = self._lock_path(worker_id)
+        if self._create_lock(lock_path, owner_pid):
+            return True
+
+        # Check-then-remove must not interleave with another process doing the
+        # same, or one could delete the other's brand-new lock
+        with self._guard():
+            try:
+                with open(lock_path, "r") as f:
+                    content = f.read().strip()
+                age = time.time() - os.path.getmtime(lock_path)
+            except FileNotFoundError:
+                return self._create_lock(lock_path, owner_pid)
+            except OSError:
+                return False
+            owner = int(content) if content.isdigit() else 0
+            # An empty lock may be one whose creator has not written its pid yet
+            if pid_alive(owner) or (not owner and age < fresh_grace):
+                return False
+            print(f"⚠️ Removing stale profile lock for worker {worker_id} (pid {owner})")
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            return self._create_lock(lock_path, owner_pid)
+
+    def try_lock(self, worker_id):
+        """Take a slot's lock file without touching its profile (False if another live process holds it)"""
+        return self._try_lock(worker_id)
+
+    def set_owner(self, worker_id, pid):
+        """
+        Hand a held lock over to another process (e.g. the Chrome using the profile)
+
+        The lock then stays valid for as long as that process runs, even after
+        this one exits, and is cleared as stale once it dies.
+        """
+        lock_path = self._lock_path(worker_id)
+        tmp_path = f"{lock_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(pid))
+        os.replace(tmp_path, lock_path)
+
+    def derive(self, worker_id):
+        """(Re)build a worker profile from the seed"""
+        target = self._profile_path(worker_id)
+        if os.path.exists(target):
+            shutil.rmtree(target, ignore_errors=True)
+
+        start = time.time()
+        linked = copied = 0
+        for root, dirs, files in os.walk(self.seed_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_NAMES]
+            rel = os.path.relpath(root, self.seed_dir)
+            top = rel.split(os.sep)[0]
+            dest_root = os.path.join(target, rel) if rel != "." else target
+            os.makedirs(dest_root, exist_ok=True)
+
+            for name in files:
+                if name in SKIP_NAMES:
+                    continue
+                src = os.path.join(root, name)
+                dst = os.path.join(dest_root, name)
+                if top in HARDLINK_DIRS:
+                    _hardlink_or_copy(src, dst)
+                    linked += 1
+                else:
+                    _reflink_or_copy(src, dst)
+                    copied += 1
+
+        print(f"✅ Derived profile for worker {worker_id} in {time.time() - start:.2f}s "
+              f"({linked} linked, {copied} copied)")
+        return target
+
+    def acquire(self, worker_id=None, refresh=True):
+        """
+        Lock a worker slot and return its profile directory
+
+        Args:
+            worker_id: Specific slot to take; the first free slot is used if None
+            refresh (bool): Rebuild the profile from the seed before handing it out
+        """
+        if not os.path.exists(self.seed_dir):
+            raise FileNotFoundError(f"Seed profile not found: {self.seed_dir}")
+
+        if worker_id is None:
+            worker_id = 0
+            while not self._try_lock(worker_id):
+                worker_id += 1
+        elif not self._try_lock(worker_id):
+            raise RuntimeError(f"Profile for worker {worker_id} is locked by another process")
+
+        try:
+            profile_path = self._profile_path(worker_id)
+            if refresh or not os.path.exists(profile_path):
+                profile_path = self.derive(worker_id)
+        except Exception:
+            self._unlock(worker_id)
+            raise
+
+        self.held[worker_id] = profile_path
+        print(f"🔧 Worker {worker_id} using profile: {profile_path}")
+        return profile_path
+
+    def _unlock(self, worker_id):
+        try:
+            os.remove(self._lock_path(worker_id))
+        except FileNotFoundError:
+            pass
+
+    def release(self, worker_id, remove=False):
+        """Unlock a worker slot, optionally deleting its profile"""
+        profile_path = self.held.pop(worker_id, None)
+        if remove and profile_path:
+            shutil.rmtree(profile_path, ignore_errors=True)
+        self._unlock(worker_id)
+
+    def release_all(self, remove=False):
+        for worker_id in list(self.held):
+            self.release(worker_id, remove=remove)
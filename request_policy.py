@@ -0,0 +1,108 @@
+"""
+Per-Step CDP Request Blocking Policy
+====================================
+Blocks heavy or irrelevant requests (images, fonts, video, third-party
+analytics/tag managers) through CDP Network.setBlockedURLs. Unlike the
+all-or-nothing --disable-images flag, the blocked set can change per step
+of run_automation, and JavaScript is never touched.
+"""
+
+RESOURCE_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp", "*.svg"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.mov"],
+    "analytics": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*demdex.net*",
+        "*omtrdc.net*",
+        "*adsrvr.org*",
+        "*amazon-adsystem.com*",
+        "*bat.bing.com*",
+        "*connect.facebook.net*",
+        "*analytics.twitter.com*",
+        "*rlcdn.com*",
+        "*tiqcdn.com*",
+        "*quantummetric.com*",
+        "*hotjar.com*",
+        "*dynatrace-managed.com*",
+    ],
+}
+
+# Everything non-essential is blocked while filling the booking form
+FORM_FILLING = ("images", "fonts", "media", "analytics")
+
+DEFAULT_STEP_CATEGORIES = {
+    "Navigate to Delta": FORM_FILLING,
+    "Select From Airport": FORM_FILLING,
+    "Select To Airport": FORM_FILLING,
+    "Select Trip Type": FORM_FILLING,
+    "Select Departure Date": FORM_FILLING,
+    "Search Flights": FORM_FILLING,
+    "Wait for Results": FORM_FILLING,
+    "Click Price Tab": FORM_FILLING,
+}
+
+
+class RequestBlockingPolicy:
+    def __init__(self, step_categories=None, default=FORM_FILLING, extra_patterns=None):
+        """
+        Initialize the blocking policy
+
+        Args:
+            step_categories (dict): Step name -> categories to block; merged over the defaults
+            default (tuple): Categories blocked for steps not listed
+            extra_patterns (list): Additional URL patterns blocked on every step
+        """
+        self.step_categories = dict(DEFAULT_STEP_CATEGORIES)
+        if step_categories:
+            self.step_categories.update(step_categories)
+        self.default = tuple(default)
+        self.extra_patterns = list(extra_patterns or [])
+        self._network_enabled = set()  # (id(driver), window handle) with Network domain enabled
+        self._applied = {}  # (id(driver), window handle) -> tuple of patterns currently blocked
+
+    def patterns_for(self, step):
+        """Return the URL patterns to block for a step"""
+        categories = self.step_categories.get(step, self.default)
+        patterns = []
+        for category in categories:
+            patterns.extend(RESOURCE_PATTERNS.get(category, []))
+        patterns.extend(self.extra_patterns)
+        return patterns
+
+    def apply(self, driver, step):
+        """Switch the current tab's blocked URL list to the one for this step"""
+        patterns = tuple(self.patterns_for(step))
+        try:
+            # CDP commands go to the current tab, so state is tracked per window handle
+            key = (id(driver), driver.current_window_handle)
+            if self._applied.get(key) == patterns:
+                return
+            if key not in self._network_enabled:
+                driver.execute_cdp_cmd("Network.enable", {})
+                self._network_enabled.add(key)
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+            self._applied[key] = patterns
+            print(f"🚫 Request policy for '{step}': blocking {len(patterns)} URL pattern(s)")
+        except Exception as e:
+            print(f"⚠️ Could not apply request policy for '{step}': {e}")
+
+    def clear(self, driver):
+        """Stop blocking anything on the current tab"""
+        try:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+            self._applied.pop((id(driver), driver.current_window_handle), None)
+        except Exception:
+            pass
+
+    def forget(self, driver):
+        """Drop cached state for a driver that has been quit"""
+        for cache in (self._network_enabled, self._applied):
+            for key in [k for k in cache if k[0] == id(driver)]:
+                if isinstance(cache, set):
+                    cache.discard(key)
+                else:
+                    cache.pop(key, None)
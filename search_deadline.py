@@ -0,0 +1,38 @@
+"""
+Per-Search Deadline Budget
+==========================
+One SearchDeadline is created per run_automation call and consulted by every
+step and wait: each wait gets min(its own cap, remaining budget), so a broken
+search fails within the configured SLA instead of compounding timeouts.
+"""
+
+import time
+
+
+class SearchDeadline:
+    def __init__(self, budget):
+        """
+        Start the clock for one search
+
+        Args:
+            budget (float): Seconds the whole search may take (None for unlimited)
+        """
+        self.budget = budget
+        self.started = time.time()
+        self.expires_at = self.started + budget if budget else None
+
+    def remaining(self):
+        """Seconds left in the budget (infinite when unlimited)"""
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def cap(self, seconds):
+        """A wait's own timeout, shortened to what is left of the budget"""
+        return max(0.0, min(seconds, self.remaining()))
+
+    def elapsed(self):
+        return time.time() - self.started
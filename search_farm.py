@@ -0,0 +1,196 @@
+"""
+Process-Pool Search Farm
+========================
+Shards a list of route/date searches across a multiprocessing pool of browser
+workers. Each worker process owns one DeltaFlightAutomationAdvanced driver and
+reuses it between searches; results, timings and failures are collected into
+one summary.
+
+Usage:
+    python search_farm.py searches.json [workers]
+
+searches.json is a list of run_automation keyword arguments, e.g.
+    [{"from_airport": "MCO", "to_airport": "BCN", "date": "09/24/25"}, ...]
+or a route/date grid:
+    {"routes": [["MCO", "BCN"], ["ATL", "LAX"]], "dates": ["09/24/25", "09/25/25"]}
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from datetime import datetime
+from multiprocessing.util import Finalize
+
+from delta_flight_automation_advanced import DeltaFlightAutomationAdvanced
+
+# Per-process browser, created by the pool initializer
+_automation = None
+_automation_kwargs = {}
+_searches_served = 0
+
+
+def _close_worker_browser():
+    global _automation
+    if _automation:
+        _automation.close()
+        _automation = None
+
+
+def _init_worker(automation_kwargs):
+    """Pool initializer: launch this worker's browser once"""
+    global _automation, _automation_kwargs
+    _automation_kwargs = automation_kwargs
+    # Pool workers exit without running atexit hooks; finalizers do run
+    Finalize(None, _close_worker_browser, exitpriority=10)
+    # An exception here would kill the worker and the pool would respawn it
+    # forever; _run_search relaunches the browser and records the failure instead
+    try:
+        _automation = DeltaFlightAutomationAdvanced(**automation_kwargs)
+    except Exception as e:
+        print(f"❌ Worker {os.getpid()} could not launch Chrome: {e}")
+        _automation = None
+
+
+def _run_search(search):
+    """Run one search on this worker's browser and report the outcome"""
+    global _automation, _searches_served
+    start = time.time()
+    outcome = {
+        "search": search,
+        "worker_pid": os.getpid(),
+        "success": False,
+        "error": None,
+        "failed_step": None,
+        "step_timings": {},
+        "dumps": [],
+        "offers": None,
+    }
+
+    try:
+        if _automation is None or not _automation.is_alive():
+            _close_worker_browser()
+            _automation = DeltaFlightAutomationAdvanced(**_automation_kwargs)
+            _searches_served = 0
+
+        # After the first search the browser is reset back to the widget, unless
+        # incremental refill can re-submit from the page the last search left
+        warm = False
+        if _searches_served > 0 and not _automation.can_refill():
+            warm = _automation.reset_for_next_search()
+        outcome["success"] = _automation.run_automation(skip_navigation=warm, **search)
+        _searches_served += 1
+
+        details = _automation.last_search or {}
+        outcome["refilled"] = details.get("refilled", False)
+        outcome["failed_step"] = details.get("failed_step")
+        outcome["step_timings"] = details.get("step_timings", {})
+        outcome["dumps"] = [path for path in details.get("dumps", []) if path]
+        outcome["error"] = details.get("error")
+        outcome["flights"] = details.get("flights", [])
+        outcome["results_file"] = details.get("results_file")
+        outcome["offers"] = details.get("offers")
+        outcome["recycle_events"] = list(_automation.recycle_events)
+        _automation.recycle_events.clear()
+    except Exception as e:
+        outcome["error"] = f"{e}\n{traceback.format_exc()}"
+
+    outcome["elapsed"] = round(time.time() - start, 2)
+    return outcome
+
+
+def load_searches(path):
+    """Load a search list (or a routes x dates grid) from a JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        extra = {k: v for k, v in data.items() if k not in ("routes", "dates")}
+        return [
+            dict(extra, from_airport=origin, to_airport=destination, date=date)
+            for origin, destination in data["routes"]
+            for date in data["dates"]
+        ]
+    return data
+
+
+def run_search_farm(searches, workers=4, headless=True, use_proxy=True, summary_file=None):
+    """
+    Run searches across a pool of browser workers
+
+    Args:
+        searches (list): run_automation keyword arguments, one dict per search
+        workers (int): Number of browser processes
+        headless (bool): Run browsers in headless mode
+        use_proxy (bool): Use proxy server for requests
+        summary_file (str): Where to write the JSON summary (timestamped default)
+
+    Returns:
+        dict: Summary with per-search outcomes
+    """
+    workers = max(1, min(workers, len(searches)))
+    print(f"🚜 Starting search farm: {len(searches)} search(es) on {workers} worker(s)")
+    print("=" * 60)
+
+    results = []
+    start = time.time()
+    automation_kwargs = {"headless": headless, "use_proxy": use_proxy}
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(automation_kwargs,)) as pool:
+        for outcome in pool.imap_unordered(_run_search, searches):
+            results.append(outcome)
+            search = outcome["search"]
+            status = "✅" if outcome["success"] else "❌"
+            print(f"{status} [{len(results)}/{len(searches)}] "
+                  f"{search.get('from_airport')}->{search.get('to_airport')} {search.get('date')} "
+                  f"in {outcome['elapsed']:.1f}s (pid {outcome['worker_pid']})")
+        pool.close()
+        pool.join()
+
+    wall_time = time.time() - start
+    succeeded = [r for r in results if r["success"]]
+    failed = [r for r in results if not r["success"]]
+    summary = {
+        "started_at": datetime.fromtimestamp(start).isoformat(timespec="seconds"),
+        "workers": workers,
+        "total": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(failed),
+        "wall_time": round(wall_time, 2),
+        "searches_per_hour": round(len(results) / wall_time * 3600, 1) if wall_time else 0,
+        "avg_search_time": round(sum(r["elapsed"] for r in results) / len(results), 2) if results else 0,
+        "failures_by_step": {},
+        "results": results,
+    }
+    for r in failed:
+        step = r["failed_step"] or "exception"
+        summary["failures_by_step"][step] = summary["failures_by_step"].get(step, 0) + 1
+
+    summary_file = summary_file or f"farm_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(summary_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print("=" * 60)
+    print(f"📊 {summary['succeeded']}/{summary['total']} succeeded in {summary['wall_time']:.1f}s "
+          f"({summary['searches_per_hour']} searches/hour)")
+    if summary["failures_by_step"]:
+        print(f"❌ Failures by step: {summary['failures_by_step']}")
+    print(f"💾 Summary saved to: {summary_file}")
+    return summary
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python search_farm.py searches.json [workers]")
+        return
+
+    searches = load_searches(argv[0])
+    workers = int(argv[1]) if len(argv) > 1 else min(4, os.cpu_count() or 1)
+    run_search_farm(searches, workers=workers, headless=True, use_proxy=False)
+
+
+if __name__ == "__main__":
+    main()
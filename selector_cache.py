@@ -0,0 +1,172 @@
+"""
+Selector Success Cache
+======================
+Remembers, per smart_wait_and_click / smart_send_keys description, which
+selector and click method last worked, and persists it to a small JSON file so
+later runs try the learned winner first instead of walking stale fallbacks.
+
+Scores decay with age (half-life) and drop on failures, so a winner that goes
+stale after a site change is forgotten quickly.
+
+Entries are keyed by description plus a hash of the selector list (the same
+description is used with different lists), and every save re-reads the file
+and merges this process's changes under a lock file, so concurrent farm
+workers don't overwrite each other's learning.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selector_cache.json")
+
+
+def selector_key(by, selector):
+    """Stable key for a (By, selector) pair, independent of its list position"""
+    return f"{by}::{selector}"
+
+
+def entry_key(description, selectors):
+    """Cache key for a description used with one particular selector list"""
+    digest = hashlib.sha1(json.dumps([list(pair) for pair in selectors]).encode("utf-8")).hexdigest()[:10]
+    return f"{description}#{digest}"
+
+
+class SelectorCache:
+    def __init__(self, path=DEFAULT_CACHE_FILE, half_life_hours=12, max_score=5, min_score=0.25):
+        """
+        Initialize the cache
+
+        Args:
+            path (str): JSON file the learned winners are persisted to
+            half_life_hours (float): Age after which a winner's score is halved
+            max_score (float): Cap so a long-standing winner still decays in reasonable time
+            min_score (float): Entries below this score are forgotten
+        """
+        self.path = path
+        self.half_life = half_life_hours * 3600
+        self.max_score = max_score
+        self.min_score = min_score
+        self.lock_path = f"{path}.lock"
+        self.entries = self._load()
+        self.changed = {}  # key -> entry (None when deleted) not yet merged into the file
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _lock(self, timeout=2, stale_after=10):
+        """Take the cache's lock file; False if it stayed busy for timeout seconds"""
+        deadline = time.time() + timeout
+        while True:
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    # A writer that died mid-save leaves its lock behind
+                    if time.time() - os.path.getmtime(self.lock_path) > stale_after:
+                        os.remove(self.lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.time() >= deadline:
+                    return False
+                time.sleep(0.02)
+
+    def _set(self, key, entry):
+        if entry is None:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = entry
+        self.changed[key] = entry
+        self._save()
+
+    def _save(self):
+        """Merge this process's changes into the file (others' entries are kept)"""
+        if not self._lock():
+            # Keep the changes pending; the next save merges them
+            return
+        try:
+            merged = self._load()
+            for key, entry in self.changed.items():
+                if entry is None:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = entry
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self.entries = merged
+            self.changed = {}
+        except OSError as e:
+            print(f"⚠️ Could not save selector cache: {e}")
+        finally:
+            try:
+                os.remove(self.lock_path)
+            except OSError:
+                pass
+
+    def _score(self, entry):
+        """Score after age decay"""
+        age = max(0, time.time() - entry.get("updated", 0))
+        return entry.get("score", 0) * 0.5 ** (age / self.half_life)
+
+    def winner(self, description):
+        """Learned entry for a description, or None if unknown or decayed"""
+        entry = self.entries.get(description)
+        if not entry:
+            return None
+        if self._score(entry) < self.min_score:
+            self._set(description, None)
+            return None
+        return entry
+
+    def order(self, description, selectors):
+        """Selector indexes with the learned winner moved to the front"""
+        indexes = list(range(len(selectors)))
+        entry = self.winner(description)
+        if entry:
+            for i, (by, selector) in enumerate(selectors):
+                if selector_key(by, selector) == entry["selector"]:
+                    indexes.remove(i)
+                    indexes.insert(0, i)
+                    break
+        return indexes
+
+    def method_order(self, description, by, selector, count):
+        """Click method indexes with the learned method first when the selector matches"""
+        indexes = list(range(count))
+        entry = self.winner(description)
+        method = entry.get("method") if entry else None
+        if method is not None and entry["selector"] == selector_key(by, selector) and 0 <= method < count:
+            indexes.remove(method)
+            indexes.insert(0, method)
+        return indexes
+
+    def record_success(self, description, by, selector, method=None):
+        """Reinforce (or replace) the winner for a description"""
+        key = selector_key(by, selector)
+        entry = self.entries.get(description)
+        if entry and entry["selector"] == key and entry.get("method") == method:
+            score = min(self._score(entry) + 1, self.max_score)
+        else:
+            score = 1
+        self._set(description, {"selector": key, "method": method, "score": score, "updated": time.time()})
+
+    def record_failure(self, description, by, selector):
+        """Penalize the learned winner when it did not work this time"""
+        entry = self.entries.get(description)
+        if not entry or entry["selector"] != selector_key(by, selector):
+            return
+        score = self._score(entry) - 2
+        if score < self.min_score:
+            self._set(description, None)
+        else:
+            self._set(description, dict(entry, score=score, updated=time.time()))
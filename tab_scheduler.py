@@ -0,0 +1,241 @@
+"""
+Multi-Tab Search Scheduler
+==========================
+Drives several searches concurrently in separate tabs of one Chrome process.
+Interactive form steps run one tab at a time (WebDriver can only focus one
+tab), but the waiting phases - page load, calendar render and flight results -
+are polled without blocking, so while one tab waits the scheduler fills
+another tab's form.
+
+GraphQL offer capture is paused while tabs run: the performance log is shared
+by all tabs, and Network.getResponseBody only works for the focused one.
+"""
+
+import time
+from datetime import datetime
+
+from delta_flight_automation_advanced import DeltaFlightAutomationAdvanced
+
+
+class _TabSearch:
+    """State of one search bound to one browser tab"""
+
+    def __init__(self, handle, search):
+        self.handle = handle
+        self.search = search
+        self.steps = []
+        self.ready_check = None  # Callable that must return True before the next step
+        self.pending_step = None  # Step whose page load is being waited on
+        self.wait_deadline = None
+        self.started = time.time()
+        self.outcome = {
+            "search": search,
+            "success": False,
+            "failed_step": None,
+            "step_timings": {},
+            "dumps": [],
+            "flights": [],
+        }
+
+
+class TabScheduler:
+    def __init__(self, automation, max_tabs=3, results_timeout=120, calendar_timeout=10, navigation_timeout=30, poll_interval=0.25):
+        """
+        Initialize the scheduler around an existing automation session
+
+        Args:
+            automation (DeltaFlightAutomationAdvanced): Session whose browser hosts the tabs
+            max_tabs (int): Number of searches in flight at once
+            results_timeout (int): Seconds to wait for flight results in a tab
+            calendar_timeout (int): Seconds to wait for the date picker in a tab
+            navigation_timeout (int): Seconds to wait for the booking widget to load in a tab
+            poll_interval (float): Pause between polling rounds when every tab is waiting
+        """
+        self.automation = automation
+        self.driver = automation.driver
+        self.max_tabs = max_tabs
+        self.results_timeout = results_timeout
+        self.calendar_timeout = calendar_timeout
+        self.navigation_timeout = navigation_timeout
+        self.poll_interval = poll_interval
+
+    def _build_steps(self, tab):
+        """Form steps for one search as (name, action, ready_check, wait_timeout)"""
+        a = self.automation
+        s = tab.search
+        date = s.get("date", "09/24/25")
+        trip_type = s.get("trip_type", "one_way")
+
+        def pick_date():
+            if a.pick_departure_date(date):
+                return True
+            if s.get("use_next_available", True):
+                print("🔄 Specific date failed, trying next available date...")
+                return a.select_next_available_date()
+            return False
+
+        def collect():
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            prefix = f"{s['from_airport']}_{s['to_airport']}_{timestamp}_tab{self._tab_index(tab)}"
+            # results_ready fires on the first result node; let fares finish loading
+            a.wait_for_angular(5, fallback_idle_ms=750)
+            tab.outcome["flights"] = a.extract_flight_cards()
+            if a.save_html_dumps:
+                tab.outcome["dumps"].append(a.dump_html(f"flight_results_initial_{prefix}.html", kind="flight_results_initial"))
+            a.apply_request_policy("Click Price Tab")
+            if a.click_price_tab():
+                tab.outcome["flights_price_tab"] = a.extract_flight_cards()
+                if a.save_html_dumps:
+                    tab.outcome["dumps"].append(a.dump_html(f"flight_results_price_tab_{prefix}.html", kind="flight_results_price_tab"))
+            return True
+
+        return [
+            # Non-blocking: the page load is polled like the calendar and results waits
+            ("Navigate to Delta", a.start_navigation, a.navigation_ready, self.navigation_timeout),
+            ("Select From Airport", lambda: a.select_from_airport(s["from_airport"]), None, None),
+            ("Select To Airport", lambda: a.select_to_airport(s["to_airport"]), None, None),
+            ("Select Trip Type", lambda: a.select_trip_type(trip_type), None, None),
+            ("Open Calendar", a.open_departure_calendar, a.calendar_ready, self.calendar_timeout),
+            ("Select Departure Date", pick_date, None, None),
+            ("Search Flights", a.search_flights, a.results_ready, self.results_timeout),
+            ("Collect Results", collect, None, None),
+        ]
+
+    def _tab_index(self, tab):
+        return self._tabs.index(tab) + 1 if tab in self._tabs else 0
+
+    def _open_tab(self, search):
+        """Reuse the first tab, open new ones for the rest"""
+        if not self._tabs and not self._used_first_tab:
+            self._used_first_tab = True
+            handle = self.driver.current_window_handle
+        else:
+            self.driver.switch_to.new_window("tab")
+            handle = self.driver.current_window_handle
+        tab = _TabSearch(handle, search)
+        tab.steps = self._build_steps(tab)
+        return tab
+
+    def _advance(self, tab):
+        """
+        Run the tab's next steps until it has to wait (or finishes)
+
+        Returns:
+            bool: True when the tab is done (success or failure)
+        """
+        self.driver.switch_to.window(tab.handle)
+
+        if tab.ready_check:
+            if not tab.ready_check():
+                if time.time() < tab.wait_deadline:
+                    return False
+                print(f"❌ Tab {self._tab_index(tab)}: timed out waiting after '{tab.pending_step}'")
+                tab.outcome["failed_step"] = tab.pending_step
+                return True
+            tab.ready_check = None
+
+        while tab.steps:
+            name, action, ready_check, wait_timeout = tab.steps.pop(0)
+            print(f"\n🗂️ Tab {self._tab_index(tab)} step: {name}")
+            self.automation.apply_request_policy(name)
+            step_start = time.time()
+            try:
+                ok = action()
+            except Exception as e:
+                print(f"❌ Tab {self._tab_index(tab)} step '{name}' raised: {e}")
+                ok = False
+            tab.outcome["step_timings"][name] = round(time.time() - step_start, 2)
+            if not ok:
+                tab.outcome["failed_step"] = name
+                return True
+            if ready_check:
+                # Hand control to other tabs while this one loads
+                tab.ready_check = ready_check
+                tab.pending_step = name
+                tab.wait_deadline = time.time() + wait_timeout
+                return False
+
+        tab.outcome["success"] = True
+        return True
+
+    def _finish(self, tab):
+        tab.outcome["elapsed"] = round(time.time() - tab.started, 2)
+        status = "✅" if tab.outcome["success"] else "❌"
+        print(f"{status} Tab search {tab.search['from_airport']}->{tab.search['to_airport']} "
+              f"{tab.search.get('date')} finished in {tab.outcome['elapsed']:.1f}s")
+        self._tabs.remove(tab)
+        # Keep one tab open so the browser session survives
+        if len(self.driver.window_handles) > 1:
+            self.driver.switch_to.window(tab.handle)
+            self.driver.close()
+        else:
+            self._used_first_tab = False
+        self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def run(self, searches):
+        """
+        Run searches interleaved across up to max_tabs tabs
+
+        Args:
+            searches (list): run_automation-style keyword dicts
+
+        Returns:
+            list: One outcome dict per search, in completion order
+        """
+        pending = list(searches)
+        self._tabs = []
+        self._used_first_tab = False
+        results = []
+        start = time.time()
+
+        print(f"🗂️ Running {len(pending)} search(es) in up to {self.max_tabs} tab(s)")
+
+        capture = self.automation.offer_capture
+        if capture and self.automation.waits:
+            self.automation.waits.remove_listener(capture.on_event)
+        try:
+            self._run_tabs(pending, results)
+        finally:
+            if capture and self.automation.waits:
+                self.automation.waits.add_listener(capture.on_event)
+
+        succeeded = sum(1 for r in results if r["success"])
+        print(f"📊 Tabs finished: {succeeded}/{len(results)} succeeded in {time.time() - start:.1f}s")
+        return results
+
+    def _run_tabs(self, pending, results):
+        """Advance tabs round-robin until every search has finished"""
+        while pending or self._tabs:
+            while pending and len(self._tabs) < self.max_tabs:
+                self._tabs.append(self._open_tab(pending.pop(0)))
+
+            progressed = False
+            for tab in list(self._tabs):
+                was_waiting = tab.ready_check is not None
+                if self._advance(tab):
+                    self._finish(tab)
+                    results.append(tab.outcome)
+                    progressed = True
+                elif not was_waiting or tab.ready_check is None:
+                    progressed = True
+
+            if not progressed:
+                time.sleep(self.poll_interval)
+
+
+def main():
+    searches = [
+        {"from_airport": "MCO", "to_airport": "BCN", "date": "09/24/25"},
+        {"from_airport": "ATL", "to_airport": "LAX", "date": "09/24/25"},
+        {"from_airport": "JFK", "to_airport": "CDG", "date": "09/24/25"},
+    ]
+
+    automation = DeltaFlightAutomationAdvanced(headless=False, use_proxy=False)
+    try:
+        TabScheduler(automation, max_tabs=3).run(searches)
+    finally:
+        automation.close()
+
+
+if __name__ == "__main__":
+    main()
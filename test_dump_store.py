@@ -0,0 +1,57 @@
+"""
+Dump Store Tests
+================
+Round-trip tests for dump_store (no browser needed): python -m pytest test_dump_store.py
+"""
+import os
+import tempfile
+
+from dump_store import DumpStore, normalize_date
+
+
+def _store():
+    return DumpStore(tempfile.mkdtemp(), codec="gzip")
+
+
+def test_put_get_and_dedupe():
+    store = _store()
+    html = "<html><body>flight-card DL 123</body></html>"
+    first = store.put(html, "flight_results_initial", {"from_airport": "MCO", "to_airport": "BCN"})
+    second = store.put(html, "flight_results_price_tab", {"from_airport": "MCO", "to_airport": "BCN"})
+
+    assert first["hash"] == second["hash"]
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert first["path"].endswith(".html.gz")
+    assert os.path.exists(os.path.join(store.root, first["path"]))
+    assert store.get_text(first["hash"]) == html
+    assert store.stats() == {"entries": 2, "blobs": 1, "logical_bytes": 2 * len(html),
+                             "stored_bytes": first["stored_size"]}
+
+
+def test_put_json_round_trip():
+    store = _store()
+    entry = store.put_json({"b": 1, "a": [1, 2]}, "scrappey_summary")
+    assert entry["path"].endswith(".json.gz")
+    assert store.get_json(entry["hash"]) == {"a": [1, 2], "b": 1}
+    # Canonical JSON: equal objects dedupe regardless of key order
+    assert store.put_json({"a": [1, 2], "b": 1}, "scrappey_summary")["deduplicated"]
+
+
+def test_find_matches_dates_across_formats():
+    store = _store()
+    bot = store.put("<p>bot</p>", "flight_results_initial", {"from_airport": "MCO", "date": "09/24/25"})
+    scrappey = store.put("<p>scrappey</p>", "scrappey_results", {"from_airport": "MCO", "date": "09/24/2025"})
+    store.put("<p>other</p>", "scrappey_results", {"from_airport": "ATL", "date": "2025-09-24"})
+
+    assert bot["params"]["date"] == "2025-09-24"
+    matches = store.find(from_airport="MCO", date="2025-09-24")
+    assert [entry["hash"] for entry in matches] == [bot["hash"], scrappey["hash"]]
+    assert store.latest("scrappey_results", date="09/24/25")["params"]["from_airport"] == "ATL"
+    assert store.find("flight_results_initial", from_airport="ATL") == []
+
+
+def test_normalize_date():
+    assert normalize_date("09/24/25") == "2025-09-24"
+    assert normalize_date("08/21/2025") == "2025-08-21"
+    assert normalize_date("2025-08-21") == "2025-08-21"
+    assert normalize_date("next week") == "next week"
@@ -0,0 +1,49 @@
+"""
+Booking Widget Field Value Tests
+================================
+Unit tests for form_values (no browser needed): python -m pytest test_form_values.py
+"""
+from datetime import date
+
+from form_values import airport_code, parse_widget_date
+
+TODAY = date(2025, 8, 9)
+
+
+def test_parse_month_day_without_year():
+    assert parse_widget_date("Sep 24", TODAY) == date(2025, 9, 24)
+    assert parse_widget_date("Wed, Sep 24", TODAY) == date(2025, 9, 24)
+    assert parse_widget_date("Depart\nSEPT 2", TODAY) == date(2025, 9, 2)
+
+
+def test_parse_never_matches_substrings_of_other_days():
+    assert parse_widget_date("Sep 24", TODAY) != date(2025, 9, 4)
+    assert parse_widget_date("Sep 24", TODAY) != date(2025, 9, 2)
+    assert parse_widget_date("Sep 2 2025", TODAY) == date(2025, 9, 2)
+    assert parse_widget_date("Sep 2 2025", TODAY) != date(2025, 9, 25)
+
+
+def test_parse_compares_year():
+    assert parse_widget_date("Sep 24, 2026", TODAY) == date(2026, 9, 24)
+    # Without a year, a month/day already past rolls over to next year
+    assert parse_widget_date("Jan 5", TODAY) == date(2026, 1, 5)
+
+
+def test_parse_other_formats():
+    assert parse_widget_date("24 Sep 2025", TODAY) == date(2025, 9, 24)
+    assert parse_widget_date("09/24/25", TODAY) == date(2025, 9, 24)
+    assert parse_widget_date("09/24/2025", TODAY) == date(2025, 9, 24)
+
+
+def test_parse_unreadable():
+    assert parse_widget_date("", TODAY) is None
+    assert parse_widget_date("Depart", TODAY) is None
+    assert parse_widget_date("Feb 30, 2025", TODAY) is None
+
+
+def test_airport_code_is_leading_token():
+    assert airport_code("SCL SANTIAGO") == "SCL"
+    assert airport_code("MCO Orlando, FL") == "MCO"
+    assert airport_code("From") is None
+    assert airport_code("") is None
+    assert airport_code("SCL SANTIAGO") != "SAN"
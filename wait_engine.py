@@ -0,0 +1,313 @@
+"""
+Network-Idle Wait Engine
+========================
+Replaces fixed time.sleep calls with waits that end as soon as the page is
+actually ready. CDP Network events are read from chromedriver's performance
+log (enabled with the goog:loggingPrefs capability, see enable_performance_log)
+to track in-flight requests; DOM quiescence is detected with an in-page
+MutationObserver, and Angular pages (idp-root) are asked directly through the
+testability API whether their zone is stable.
+
+Every wait takes a timeout that acts as the old sleep's upper bound, so a
+page that is already idle costs milliseconds instead of seconds.
+"""
+
+import json
+import time
+
+# Requests that may stay open forever and must not block "network idle"
+DEFAULT_IGNORE_PATTERNS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "demdex.net",
+    "omtrdc.net",
+    "dynatrace-managed.com",
+    "quantummetric.com",
+    "/akam/",
+]
+
+DOM_QUIET_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), last = Date.now();
+var observer = new MutationObserver(function () { last = Date.now(); });
+observer.observe(document.documentElement || document, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+(function check() {
+    var now = Date.now();
+    if (now - last >= quietMs) { observer.disconnect(); done(true); }
+    else if (now - start >= timeoutMs) { observer.disconnect(); done(false); }
+    else { setTimeout(check, 50); }
+})();
+"""
+
+# Resolves true once every Angular root reports whenStable, false on timeout,
+# null when the page exposes no Angular testability (non-Angular page, or a
+# production build without testing support). While an idp-root is present it
+# waits for bootstrap, but only until readyState is complete plus a short grace.
+ANGULAR_STABLE_SCRIPT = """
+var timeoutMs = arguments[0], graceMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), finished = false, completeAt = null;
+function finish(value) { if (!finished) { finished = true; done(value); } }
+var timer = setTimeout(function () { finish(null); }, timeoutMs);
+(function attach() {
+    var testabilities = typeof window.getAllAngularTestabilities === 'function'
+        ? window.getAllAngularTestabilities() : [];
+    if (!testabilities || !testabilities.length) {
+        if (document.readyState === 'complete' && completeAt === null) { completeAt = Date.now(); }
+        var bootstrapping = document.querySelector('idp-root')
+            && (completeAt === null || Date.now() - completeAt < graceMs);
+        if (bootstrapping) {
+            setTimeout(attach, 50);
+        } else {
+            finish(null);
+        }
+        return;
+    }
+    // Testability found: from here a timeout means the zone never went stable
+    clearTimeout(timer);
+    setTimeout(function () { finish(false); }, Math.max(0, timeoutMs - (Date.now() - start)));
+    var pending = testabilities.length;
+    testabilities.forEach(function (testability) {
+        testability.whenStable(function () { if (--pending === 0) { finish(true); } });
+    });
+})();
+"""
+
+# Evaluates a whole selector list in one round trip: [index, element] of the
+# first selector that matches, or null
+SELECTOR_RACE_SCRIPT = """
+var specs = arguments[0];
+for (var i = 0; i < specs.length; i++) {
+    var element = null;
+    try {
+        if (specs[i][0] === 'xpath') {
+            element = document.evaluate(specs[i][1], document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } else {
+            element = document.querySelector(specs[i][1]);
+        }
+    } catch (e) {
+        element = null;
+    }
+    if (element && element.nodeType === 1) { return [i, element]; }
+}
+return null;
+"""
+
+
+def selector_spec(by, selector):
+    """Translate a Selenium (By, selector) pair into an in-page ['xpath'|'css', query] spec"""
+    if by == "xpath":
+        return ["xpath", selector]
+    if by == "css selector":
+        return ["css", selector]
+    if by == "id":
+        return ["css", f"[id={json.dumps(selector)}]"]
+    if by == "name":
+        return ["css", f"[name={json.dumps(selector)}]"]
+    if by == "class name":
+        return ["css", f".{selector}"]
+    if by == "tag name":
+        return ["css", selector]
+    if by == "link text":
+        return ["xpath", f"//a[normalize-space(.)={json.dumps(selector)}]"]
+    if by == "partial link text":
+        return ["xpath", f"//a[contains(., {json.dumps(selector)})]"]
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+def enable_performance_log(chrome_options):
+    """Ask chromedriver to record CDP Network events in the performance log"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+
+class WaitEngine:
+    def __init__(self, driver, poll_interval=0.1, ignore_patterns=None, stale_after=15):
+        """
+        Initialize the wait engine for a driver
+
+        Args:
+            driver: Selenium Chrome driver created with enable_performance_log()
+            poll_interval (float): Seconds between event log drains
+            ignore_patterns (list): URL substrings that never count as in-flight
+            stale_after (float): Seconds after which an unfinished request is ignored
+        """
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.ignore_patterns = list(DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns)
+        self.stale_after = stale_after
+        self.inflight = {}  # requestId -> (url, started_at)
+        self.finished = []  # (url, finished_at) of recently completed requests
+        self.listeners = []  # Callables receiving (method, params) for every event
+        self.available = True
+
+    def add_listener(self, listener):
+        """Receive every CDP Network event as listener(method, params)"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def pump(self):
+        """Drain the performance log and update request tracking"""
+        if not self.available:
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            # Logging capability missing (e.g. attached session): fall back to DOM waits only
+            self.available = False
+            return
+
+        now = time.time()
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method", "")
+            params = message.get("params", {})
+            if not method.startswith("Network."):
+                continue
+
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                url = params.get("request", {}).get("url", "")
+                if not url.startswith("data:") and not any(p in url for p in self.ignore_patterns):
+                    self.inflight[request_id] = (url, now)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                url, _ = self.inflight.pop(request_id, ("", now))
+                self.finished.append((url, now))
+
+            for listener in self.listeners:
+                try:
+                    listener(method, params)
+                except Exception as e:
+                    print(f"⚠️ Network event listener failed: {e}")
+
+        # Only recent completions matter for wait_for_request
+        self.finished = [(url, t) for url, t in self.finished if now - t < 60]
+
+    def _busy(self, now):
+        return sum(1 for _, started in self.inflight.values() if now - started < self.stale_after)
+
+    def wait_for_network_idle(self, idle_ms=500, timeout=10, max_inflight=0):
+        """
+        Wait until at most max_inflight requests have been open for idle_ms
+
+        Returns:
+            bool: True if the network went idle before the timeout
+        """
+        deadline = time.time() + timeout
+        idle_since = None
+        while True:
+            self.pump()
+            if not self.available:
+                return self.wait_for_dom_quiet(quiet_ms=idle_ms, timeout=max(0, deadline - time.time()))
+
+            now = time.time()
+            if self._busy(now) <= max_inflight:
+                idle_since = idle_since or now
+                if (now - idle_since) * 1000 >= idle_ms:
+                    return True
+            else:
+                idle_since = None
+
+            if now >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_request(self, url_contains, timeout=15, since=None):
+        """
+        Wait until a request whose URL contains url_contains has finished
+
+        Args:
+            since (float): Only count requests finished after this time.time() value
+        """
+        since = since if since is not None else 0
+        deadline = time.time() + timeout
+        while True:
+            self.pump()
+            if any(url_contains in url and t >= since for url, t in self.finished):
+                return True
+            if not self.available or time.time() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_dom_quiet(self, quiet_ms=300, timeout=5):
+        """Wait until the DOM has not mutated for quiet_ms"""
+        if timeout <= 0:
+            return False
+        try:
+            return bool(self.driver.execute_async_script(DOM_QUIET_SCRIPT, quiet_ms, int(timeout * 1000)))
+        except Exception:
+            return False
+
+    def wait_for_angular_stable(self, timeout=10, bootstrap_grace_ms=500):
+        """
+        Wait until Angular has no pending macrotasks (XHRs, timers) or change detection
+
+        Args:
+            timeout (float): Seconds to wait for stability
+            bootstrap_grace_ms (int): How long after readyState 'complete' to keep
+                looking for Angular testability before giving up on it
+
+        Returns:
+            bool or None: True when stable, False on timeout, None when the page
+            exposes no Angular testability
+        """
+        if timeout <= 0:
+            return False
+        try:
+            return self.driver.execute_async_script(ANGULAR_STABLE_SCRIPT, int(timeout * 1000), bootstrap_grace_ms)
+        except Exception:
+            return None
+
+    def first_match(self, selectors, timeout=5):
+        """
+        Poll all selectors at once until one of them matches
+
+        Args:
+            selectors (list): List of tuples (By, selector_string)
+            timeout (float): Seconds to keep polling
+
+        Returns:
+            tuple or None: (index into selectors, WebElement) of the first match
+        """
+        specs = [selector_spec(by, selector) for by, selector in selectors]
+        deadline = time.time() + timeout
+        while True:
+            try:
+                match = self.driver.execute_script(SELECTOR_RACE_SCRIPT, specs)
+            except Exception:
+                match = None
+            if match:
+                return int(match[0]), match[1]
+            if time.time() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def until(self, condition, timeout=5):
+        """Poll a callable until it returns truthy, draining network events meanwhile"""
+        deadline = time.time() + timeout
+        while True:
+            self.pump()
+            try:
+                if condition():
+                    return True
+            except Exception:
+                pass
+            if time.time() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def settle(self, timeout=5, idle_ms=500, quiet_ms=300):
+        """Network idle followed by DOM quiescence, all within timeout"""
+        deadline = time.time() + timeout
+        network_idle = self.wait_for_network_idle(idle_ms=idle_ms, timeout=timeout)
+        dom_quiet = self.wait_for_dom_quiet(quiet_ms=quiet_ms, timeout=deadline - time.time())
+        return network_idle and dom_quiet